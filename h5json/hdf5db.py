@@ -49,6 +49,12 @@ This class is used to manage UUID lookup tables for primary HDF objects (Groups,
     description contains dataset creation properties"
     members: sub-group with link name as UUID.  Sub-group attributes are the creation props
 
+"{dataset_lengths}":
+    description: logical extents of datasets being appended to
+    members: none
+    attrs: map of UUID to [axis, length] for datasets whose extent along axis
+        has been grown past length by appendDatasetValuesByUuid
+
 "{datatypes}"
     description: contains map of UUID->datatyped objects
     members: hard link to each anonymous datatype (i.e. datatypes which are not
@@ -61,11 +67,24 @@ This class is used to manage UUID lookup tables for primary HDF objects (Groups,
     members: none
     attrs: map of file offset to UUID
 
+"{timestamps}"
+    description: dataset of create and modified times for objects, links and
+        attributes.  Older files stored these as attributes of the "{ctime}"
+        and "{mtime}" groups; they are copied here when the file is first
+        opened, and the groups are kept (with just the root timestamps for
+        new files) so older versions can still open the file.
+    fields: 'key' - 64 bit hash of the timestamp name (see getTimeStampName),
+        'ctime', 'mtime' - timestamps (0 if not set)
+
 
 
 
 """
+import collections
 import errno
+import hashlib
+import itertools
+import struct
 import time
 import h5py
 import numpy as np
@@ -74,9 +93,17 @@ import os.path as op
 import os
 import json
 import logging
+import zlib
+from multiprocessing.pool import ThreadPool
 
 from .hdf5dtype import getTypeItem, createDataType, getItemSize 
 
+try:
+    # registers the Blosc, LZ4, Zstd, bitshuffle, ... filter plugins
+    import hdf5plugin
+except ImportError:
+    hdf5plugin = None
+
 # global dictionary to direct back to the Hdf5db instance by filename
 # (needed for visititems callback)
 # Will break in multi-threaded context
@@ -92,7 +119,12 @@ _HDF_FILTERS = {
     4: {'class': 'H5Z_FILTER_SZIP', 'alias': 'szip', 'options': ['bitsPerPixel', 'coding', 'pixelsPerBlock', 'pixelsPerScanLine']},
     5: {'class': 'H5Z_FILTER_NBIT'},
     6: {'class': 'H5Z_FILTER_SCALEOFFSET', 'alias': 'scaleoffset', 'options': ['scaleType']},
-    32000: {'class': 'H5Z_FILTER_LZF', 'alias': 'lzf'}
+    32000: {'class': 'H5Z_FILTER_LZF', 'alias': 'lzf'},
+    # registered third party filters, used if the filter plugin is available
+    32001: {'class': 'H5Z_FILTER_BLOSC', 'plugin': True},
+    32004: {'class': 'H5Z_FILTER_LZ4', 'plugin': True},
+    32008: {'class': 'H5Z_FILTER_BITSHUFFLE', 'plugin': True},
+    32015: {'class': 'H5Z_FILTER_ZSTD', 'plugin': True}
 }
 
 _HDF_FILTER_OPTION_ENUMS = {'coding': {h5py.h5z.SZIP_EC_OPTION_MASK: 'H5_SZIP_EC_OPTION_MASK',
@@ -111,6 +143,139 @@ _H5PY_FILTERS = {'gzip': 1,
 
 _H5PY_COMPRESSION_FILTERS = ("gzip", "lzf", "szip")
 
+# min size of a selection read through a memory map (smaller reads go
+# through HDF5, which is cheaper than setting up the map)
+_MEMMAP_MIN_BYTES = 1024 * 1024
+
+# max size of the blocks read for queries and aggregates
+_QUERY_BLOCK_BYTES = 4 * 1024 * 1024
+
+# max number of points written with one point selection
+_POINT_BATCH_SIZE = 256 * 1024
+
+# default number of bytes per block for streamDatasetBytesByUuid
+_STREAM_BLOCK_BYTES = 4 * 1024 * 1024
+
+# max number of chunks to read one by one for a planned read
+_MAX_PLANNED_CHUNKS = 4096
+
+# max number of chunked datasets kept open (so their chunk caches persist)
+_MAX_OPEN_DATASETS = 64
+
+# upper limit for chunk cache sizes picked by auto_chunk_cache
+_MAX_AUTO_CHUNK_CACHE = 64 * 1024 * 1024
+
+# default max time (in seconds) writes are held in a dataset write buffer
+_WRITE_BUFFER_MAX_AGE = 1.0
+
+# filters that can be applied outside of HDF5 for parallel chunk writes/reads
+_PARALLEL_CHUNK_FILTERS = (1, 2)  # deflate, shuffle
+
+# filter pipelines tried for datasets created with "filters": "auto"
+_AUTO_FILTER_CANDIDATES = (
+    (),
+    ({'id': 32000},),
+    ({'id': 2}, {'id': 32000}),
+    ({'id': 1, 'level': 1},),
+    ({'id': 2}, {'id': 1, 'level': 1}),
+    ({'id': 1, 'level': 4},),
+    ({'id': 2}, {'id': 1, 'level': 4}),
+    ({'id': 1, 'level': 9},),
+    ({'id': 2}, {'id': 1, 'level': 9}))
+
+# goals for picking an auto filter pipeline ("filterGoal" creation property)
+_AUTO_FILTER_GOALS = ("balanced", "ratio", "throughput")
+
+# max number of chunks of the first write used to trial the auto filters
+_AUTO_FILTER_SAMPLE_CHUNKS = 8
+
+# each auto filter trial compresses the sample repeatedly, up to at least
+# this many bytes (or _AUTO_FILTER_MAX_REPEATS times), and keeps the best time
+_AUTO_FILTER_TRIAL_BYTES = 4 * 1024 * 1024
+_AUTO_FILTER_MAX_REPEATS = 16
+
+# clock for the auto filter trials (time.perf_counter is python 3 only)
+_trial_clock = getattr(time, 'perf_counter', time.time)
+
+# timestamp table row, and number of changed timestamps that triggers a write
+_TIMESTAMP_DTYPE = np.dtype([('key', '<i8'), ('ctime', '<i8'), ('mtime', '<i8')])
+_TIMESTAMP_BATCH_SIZE = 4096
+
+# default max time (in seconds) changed timestamps are held before being written
+_TIMESTAMP_MAX_AGE = 1.0
+
+# access hints for picking chunk dims ("accessHint" creation property)
+_ACCESS_HINTS = ("row", "column", "tile", "append")
+
+# default chunk size for chunk dims picked from an access hint (the size
+# of the default HDF5 chunk cache)
+_CHUNK_TARGET_BYTES = 1024 * 1024
+
+
+def _shuffleBytes(buf, elem_size):
+    # byte shuffle as done by the HDF5 shuffle filter
+    if elem_size <= 1 or len(buf) < 2 * elem_size:
+        return buf
+    nbytes = (len(buf) // elem_size) * elem_size
+    arr = np.frombuffer(buf, dtype=np.uint8, count=nbytes)
+    shuffled = arr.reshape(-1, elem_size).T.tobytes()
+    return shuffled + bytes(buf[nbytes:])
+
+
+def _unshuffleBytes(buf, elem_size):
+    # undo _shuffleBytes
+    if elem_size <= 1 or len(buf) < 2 * elem_size:
+        return buf
+    nbytes = (len(buf) // elem_size) * elem_size
+    arr = np.frombuffer(buf, dtype=np.uint8, count=nbytes)
+    unshuffled = arr.reshape(elem_size, -1).T.tobytes()
+    return unshuffled + bytes(buf[nbytes:])
+
+
+def _getTimeStampKey(ts_name):
+    # 64 bit key for a timestamp name (stable between processes, unlike hash())
+    if isinstance(ts_name, six.text_type):
+        ts_name = ts_name.encode('utf-8')
+    return struct.unpack('<q', hashlib.md5(ts_name).digest()[:8])[0]
+
+
+def _getChunkShape(shape, max_shape, item_size, hint, chunk_bytes):
+    # chunk dims of about chunk_bytes shaped for the given access hint:
+    #   row, append - whole rows (last dims first), so scans and appends along
+    #     the first dimension touch few chunks
+    #   column - long runs along the first dims, so reading a column touches
+    #     few chunks
+    #   tile - about the same extent in each dim
+    # returns None if a fixed dim is empty (no chunk dims would fit)
+    rank = len(shape)
+    limits = list(shape)  # chunk dims can't exceed fixed dims
+    if max_shape is not None:
+        limits = list(max_shape)  # None for unlimited dims
+    if 0 in limits:
+        return None
+    elems = max(1, chunk_bytes // max(1, item_size))
+    chunks = [1] * rank
+    if hint == "tile":
+        order = sorted(range(rank), key=lambda i: (limits[i] is None, limits[i]))
+        for (n, i) in enumerate(order):
+            side = int(round(elems ** (1.0 / (rank - n))))
+            if limits[i] is not None:
+                side = min(side, limits[i])
+            chunks[i] = max(1, side)
+            elems = max(1, elems // chunks[i])
+    else:
+        if hint == "column":
+            order = range(rank)
+        else:
+            order = reversed(range(rank))
+        for i in order:
+            extent = elems
+            if limits[i] is not None:
+                extent = min(extent, limits[i])
+            chunks[i] = max(1, extent)
+            elems = max(1, elems // chunks[i])
+    return tuple(chunks)
+
 
 def visitObj(path, obj):
     hdf5db = _db[obj.file.filename]
@@ -136,9 +301,34 @@ class Hdf5db:
         versionInfo['hdf5_version'] = h5py.version.hdf5_version
         return versionInfo
 
+    """
+      rdcc_nbytes, rdcc_nslots, rdcc_w0 - raw data chunk cache settings used
+        for all datasets in the file (HDF5 defaults if not set)
+      auto_chunk_cache - if True, the chunk cache of each chunked dataset is
+        sized to hold a row of chunks, and grown (up to _MAX_AUTO_CHUNK_CACHE)
+        when reads touch more chunks than the cache can hold
+      value_cache_bytes - if non-zero, json and binary results of
+        getDatasetValuesByUuid are kept in an LRU cache of up to this many bytes
+      chunk_threads - if more than 1, chunk aligned writes to deflate/shuffle
+        datasets are compressed, and reads from them decompressed, by this
+        many threads
+      sparse_writes - if True, chunks that are not yet allocated are left
+        unallocated when a write would fill them with only the fill value
+      memmap_reads - if True, reads of at least _MEMMAP_MIN_BYTES from
+        contiguous, unfiltered datasets use a memory map of the file.  The
+        map bypasses HDF5, so values written through the h5py objects
+        (e.g. from getDatasetObjByUuid) are only seen after flush()
+      timestamp_max_age - max time in seconds that changed create/modified
+        times are held in memory (repeated updates to an object are
+        coalesced) before being written by the next call to any method.
+        None holds them until flush(), close, or a full batch
+    """
     def __init__(self, filePath, dbFilePath=None, readonly=False,
                  app_logger=None, root_uuid=None, update_timestamps=True,
-                 userid=None):
+                 userid=None, rdcc_nbytes=None, rdcc_nslots=None, rdcc_w0=None,
+                 auto_chunk_cache=False, value_cache_bytes=0, chunk_threads=0,
+                 sparse_writes=False, timestamp_max_age=_TIMESTAMP_MAX_AGE,
+                 memmap_reads=False):
         if app_logger:
             self.log = app_logger
         else:
@@ -164,7 +354,36 @@ class Hdf5db:
 
         self.update_timestamps = update_timestamps
 
-        self.f = h5py.File(filePath, mode, libver='latest')
+        # chunk cache settings (h5py 2.9 or later)
+        cache_kwargs = {}
+        if rdcc_nbytes is not None:
+            cache_kwargs['rdcc_nbytes'] = rdcc_nbytes
+        if rdcc_nslots is not None:
+            cache_kwargs['rdcc_nslots'] = rdcc_nslots
+        if rdcc_w0 is not None:
+            cache_kwargs['rdcc_w0'] = rdcc_w0
+        self.auto_chunk_cache = auto_chunk_cache
+        self._chunk_cache = {}  # per-dataset chunk cache settings
+        self._datasets = collections.OrderedDict()  # open chunked datasets
+        self.value_cache_bytes = value_cache_bytes
+        self._value_cache = collections.OrderedDict()  # key -> (mtime, values, nbytes)
+        self._value_cache_keys = {}  # uuid -> set of keys in _value_cache
+        self._value_cache_size = 0
+        self.chunk_threads = chunk_threads
+        self.sparse_writes = sparse_writes
+        self.memmap_reads = memmap_reads
+        self._chunk_pool = None  # created on first use
+        self._append_lengths = None  # uuid -> (axis, length), loaded on first use
+        self._write_buffers = {}  # uuid -> buffered writes for the dataset
+        self._auto_filters = None  # uuids with filters still to be picked, loaded on first use
+        self._timestamps = None  # key -> [ctime, mtime, row], loaded on first use
+        self._timestamps_dirty = set()  # keys of timestamps not yet written
+        self._timestamps_dirty_time = None  # time of the oldest unwritten change
+        self.timestamp_max_age = timestamp_max_age
+        self._acls = {}  # uuid -> dict of userid to acl (None if no ACLs)
+        self._memmap_flush = False  # True if values were written since the last flush
+
+        self.f = h5py.File(filePath, mode, libver='latest', **cache_kwargs)
 
         self.root_uuid = root_uuid
 
@@ -197,6 +416,18 @@ class Hdf5db:
     def __exit__(self, type, value, traceback):
         self.log.info('Hdf5db __exit')
         filename = self.f.filename
+        self._flushWriteBuffers()
+        self._trimAppendedDatasets()
+        if self._timestamps is not None:
+            self._flushTimeStamps()
+        self._datasets.clear()
+        self._value_cache.clear()
+        self._value_cache_keys.clear()
+        self._value_cache_size = 0
+        self._acls.clear()
+        if self._chunk_pool is not None:
+            self._chunk_pool.close()
+            self._chunk_pool = None
         self.f.flush()
         self.f.close()
         if self.dbf:
@@ -224,6 +455,102 @@ class Hdf5db:
                 raise IOError(errno.EIO, msg)
         return ts_name
 
+    """
+      _getTimeStamps - return the timestamp table (dict of key hash to
+        [ctime, mtime, row]), loading it from {timestamps} on first use.
+        Files with the older per-timestamp {ctime}/{mtime} attributes are
+        migrated.
+    """
+    def _getTimeStamps(self):
+        if self._timestamps is None:
+            self._timestamps = {}
+            self._timestamps_dirty = set()
+            if "{timestamps}" in self.dbGrp:
+                arr = self.dbGrp["{timestamps}"][...]
+                rows = zip(arr['key'].tolist(), arr['ctime'].tolist(), arr['mtime'].tolist())
+                for (row, (key, ctime, mtime)) in enumerate(rows):
+                    self._timestamps[key] = [ctime, mtime, row]
+            else:
+                self._migrateTimeStamps()
+        return self._timestamps
+
+    """
+      _migrateTimeStamps - copy timestamps from the {ctime}/{mtime} group
+        attributes into {timestamps}.  The groups are left in place for older
+        versions, which won't see changes made after the migration.
+    """
+    def _migrateTimeStamps(self):
+        for (grp_name, index) in (("{ctime}", 0), ("{mtime}", 1)):
+            if grp_name not in self.dbGrp:
+                continue
+            for (ts_name, timestamp) in self.dbGrp[grp_name].attrs.items():
+                key = _getTimeStampKey(ts_name)
+                if key not in self._timestamps:
+                    self._timestamps[key] = [0, 0, None]
+                self._timestamps[key][index] = int(timestamp)
+                self._timestamps_dirty.add(key)
+        if self._timestamps_dirty:
+            self.log.info("migrating " + str(len(self._timestamps)) + " timestamps")
+            self._flushTimeStamps()
+
+    """
+      _flushTimeStamps - write changed timestamps to {timestamps}
+    """
+    def _flushTimeStamps(self):
+        if not self._timestamps_dirty:
+            return
+        if "{timestamps}" not in self.dbGrp:
+            self.dbGrp.create_dataset("{timestamps}", (0,), dtype=_TIMESTAMP_DTYPE,
+                                      maxshape=(None,), chunks=(_TIMESTAMP_BATCH_SIZE,))
+        dset = self.dbGrp["{timestamps}"]
+        nrows = dset.shape[0]
+        rows = []  # (row, key, ctime, mtime)
+        for key in self._timestamps_dirty:
+            entry = self._timestamps[key]
+            if entry[2] is None:
+                entry[2] = nrows  # new timestamp, add a row
+                nrows += 1
+            rows.append((entry[2], key, entry[0], entry[1]))
+        self._timestamps_dirty.clear()
+        self._timestamps_dirty_time = None
+        if nrows > dset.shape[0]:
+            dset.resize((nrows,))
+        rows.sort()
+        # write each run of consecutive rows with one call
+        start = 0
+        while start < len(rows):
+            end = start + 1
+            while end < len(rows) and rows[end][0] == rows[end - 1][0] + 1:
+                end += 1
+            arr = np.array([row[1:] for row in rows[start:end]], dtype=_TIMESTAMP_DTYPE)
+            dset[rows[start][0]:rows[end - 1][0] + 1] = arr
+            start = end
+
+    """
+      _setTimeStamp - set ctime (index 0) or mtime (index 1) for the given
+        timestamp name.  Changes are written to the file in batches, or once
+        the oldest change is timestamp_max_age seconds old.
+    """
+    def _setTimeStamp(self, ts_name, index, timestamp):
+        timestamps = self._getTimeStamps()
+        key = _getTimeStampKey(ts_name)
+        entry = timestamps.get(key)
+        if entry is None:
+            entry = [0, 0, None]
+            timestamps[key] = entry
+        elif index == 0 and entry[0]:
+            self.log.warning("modifying create time for object: " + ts_name)
+        entry[index] = int(timestamp)
+        now = time.time()
+        if self._timestamps_dirty_time is None:
+            self._timestamps_dirty_time = now
+        self._timestamps_dirty.add(key)
+        if len(self._timestamps_dirty) >= _TIMESTAMP_BATCH_SIZE:
+            self._flushTimeStamps()
+        elif self.timestamp_max_age is not None and \
+                now - self._timestamps_dirty_time >= self.timestamp_max_age:
+            self._flushTimeStamps()
+
     """
       setCreateTime - sets the create time timestamp for the
             given object.
@@ -239,13 +566,10 @@ class Hdf5db:
     def setCreateTime(self, uuid, objType="object", name=None, timestamp=None):
         if not self.update_timestamps:
             return
-        ctime_grp = self.dbGrp["{ctime}"]
         ts_name = self.getTimeStampName(uuid, objType, name)
         if timestamp is None:
             timestamp = time.time()
-        if ts_name in ctime_grp.attrs:
-            self.log.warning("modifying create time for object: " + ts_name)
-        ctime_grp.attrs.create(ts_name, timestamp, dtype='int64')
+        self._setTimeStamp(ts_name, 0, timestamp)
 
     """
       getCreateTime - gets the create time timestamp for the
@@ -258,16 +582,17 @@ class Hdf5db:
        returns - create time for object, or create time for root if not set
     """
     def getCreateTime(self, uuid, objType="object", name=None, useRoot=True):
-        ctime_grp = self.dbGrp["{ctime}"]
+        timestamps = self._getTimeStamps()
         ts_name = self.getTimeStampName(uuid, objType, name)
         timestamp = None
-        if ts_name in ctime_grp.attrs:
-            timestamp = ctime_grp.attrs[ts_name]
+        entry = timestamps.get(_getTimeStampKey(ts_name))
+        if entry is not None and entry[0]:
+            timestamp = entry[0]
         elif useRoot:
             # return root timestamp
-            root_uuid = self.dbGrp.attrs["rootUUID"]
-            if root_uuid in ctime_grp.attrs:
-                timestamp = ctime_grp.attrs[root_uuid]
+            entry = timestamps.get(_getTimeStampKey(self.root_uuid))
+            if entry is not None and entry[0]:
+                timestamp = entry[0]
         return timestamp
 
     """
@@ -284,11 +609,10 @@ class Hdf5db:
     def setModifiedTime(self, uuid, objType="object", name=None, timestamp=None):
         if not self.update_timestamps:
             return
-        mtime_grp = self.dbGrp["{mtime}"]
         ts_name = self.getTimeStampName(uuid, objType, name)
         if timestamp is None:
             timestamp = time.time()
-        mtime_grp.attrs.create(ts_name, timestamp, dtype='int64')
+        self._setTimeStamp(ts_name, 1, timestamp)
 
     """
       getModifiedTime - gets the modified time timestamp for the
@@ -301,20 +625,20 @@ class Hdf5db:
        returns - create time for object, or create time for root if not set
     """
     def getModifiedTime(self, uuid, objType="object", name=None, useRoot=True):
-        mtime_grp = self.dbGrp["{mtime}"]
+        timestamps = self._getTimeStamps()
         ts_name = self.getTimeStampName(uuid, objType, name)
         timestamp = None
-        if ts_name in mtime_grp.attrs:
-            timestamp = mtime_grp.attrs[ts_name]
-        else:
+        entry = timestamps.get(_getTimeStampKey(ts_name))
+        if entry is not None and entry[1]:
+            timestamp = entry[1]
+        elif entry is not None and entry[0]:
             # return create time if no modified time has been set
-            ctime_grp = self.dbGrp["{ctime}"]
-            if ts_name in ctime_grp.attrs:
-                timestamp = ctime_grp.attrs[ts_name]
-            elif useRoot:
-                # return root timestamp
-                root_uuid = self.dbGrp.attrs["rootUUID"]
-                timestamp = mtime_grp.attrs[root_uuid]
+            timestamp = entry[0]
+        elif useRoot:
+            # return root timestamp
+            entry = timestamps.get(_getTimeStampKey(self.root_uuid))
+            if entry is not None and entry[1]:
+                timestamp = entry[1]
         return timestamp
 
     """
@@ -364,8 +688,29 @@ class Hdf5db:
         # create dataset
         dt = self.getAclDtype()
         acl_group.create_dataset(obj_uuid, (0,), dtype=dt, maxshape=(None,))
+        self._acls.pop(obj_uuid, None)
         return acl_group[obj_uuid]
 
+    """
+      _getAclTable - return dict of userid to acl for the given uuid, or None
+        if there is no ACL dataset for the object.  The dataset is read once,
+        and the table kept until the ACLs are changed by setAcl.
+    """
+    def _getAclTable(self, obj_uuid):
+        if obj_uuid in self._acls:
+            return self._acls[obj_uuid]
+
+        acl_table = None
+        acl_dset = self.getAclDataset(obj_uuid)
+        if acl_dset is not None:
+            acl_table = {}
+            for item in acl_dset[...]:
+                acl = self.convertAclNdArrayToDict(item)
+                if acl['userid'] not in acl_table:
+                    acl_table[acl['userid']] = acl  # first row for user is used
+        self._acls[obj_uuid] = acl_table
+        return acl_table
+
     """
       getNumAcls - return number of acls associatted with given uuid
     """
@@ -417,9 +762,8 @@ class Hdf5db:
         5) 'all perm' ACL
     """
     def getAcl(self, obj_uuid, userid):
-        acl_grp = self.getAclGroup()
-
-        if acl_grp is not None:
+        if self._getAclTable(obj_uuid) is not None or \
+                self._getAclTable(self.root_uuid) is not None:
             acl = self.getAclByObjAndUser(obj_uuid, userid)
             if acl is not None:
                 return acl
@@ -454,21 +798,10 @@ class Hdf5db:
     def getAclByObjAndUser(self, obj_uuid, userid):
 
         acl = None
-        acl_dset = self.getAclDataset(obj_uuid)
+        acl_table = self._getAclTable(obj_uuid)
 
-        if acl_dset:
-            # iterate through elements, looking for user_id
-            acls = acl_dset[...]
-            num_acls = acl_dset.shape[0]
-            acl = None
-            for i in range(num_acls):
-                item = acls[i]
-                if item['userid'] == userid:
-                    acl = item
-                    break
-
-        if acl is not None:
-            acl = self.convertAclNdArrayToDict(acl)
+        if acl_table and userid in acl_table:
+            acl = dict(acl_table[userid])  # copy, so the table isn't modified
         return acl
 
     """
@@ -481,16 +814,24 @@ class Hdf5db:
         acl_dset = self.getAclDataset(obj_uuid)
 
         if acl_dset:
-            # iterate through elements, looking for user_id
-            num_acls = acl_dset.shape[0]
-
-            for i in range(num_acls):
-                item = acl_dset[i]
+            # read all the elements with one call
+            for item in acl_dset[...]:
                 acl = self.convertAclNdArrayToDict(item)
                 acls.append(acl)
 
         return acls
 
+    """
+      getAclsForUser - return dict of uuid to the ACL that applies to the
+        given userid for each of the given uuids (see getAcl for the
+        precedence used).  Each ACL dataset is read at most once.
+    """
+    def getAclsForUser(self, userid, obj_uuids):
+        acls = {}
+        for obj_uuid in obj_uuids:
+            acls[obj_uuid] = self.getAcl(obj_uuid, userid)
+        return acls
+
     """
       setAcl -  set the acl for given uuid.
     """
@@ -527,9 +868,66 @@ class Hdf5db:
         for field in acl.keys():
             item[field] = acl[field]
         acl_dset[user_index] = item  # save back to the file
+        self._acls.pop(obj_uuid, None)
+
+    """
+      setAcls - set a list of acls for the given uuid.  Acls for userids
+        that already have a row are updated, the others are added, and the
+        ACL dataset is resized and written once.
+    """
+    def setAcls(self, obj_uuid, acls):
+        dt = self.getAclDtype()
+        for acl in acls:
+            if 'userid' not in acl:
+                msg = "userid not provided for acl"
+                self.log.info(msg)
+                raise IOError(errno.EINVAL, msg)
+            for field in acl.keys():
+                if field not in dt.names:
+                    msg = "invalid acl field: " + field
+                    self.log.info(msg)
+                    raise IOError(errno.EINVAL, msg)
+
+        acl_dset = self.getAclDataset(obj_uuid, create=True)
+
+        if acl_dset is None:
+            msg = "Unexpected error acl not created for uuid:[" + obj_uuid + "]"
+            self.log.error(msg)
+            raise IOError(errno.EIO, msg)
+
+        arr = acl_dset[...]
+        num_acls = arr.shape[0]
+        user_index = {}  # userid -> row, first row for the user is used
+        for (i, userid) in enumerate(arr['userid'].tolist()):
+            if userid not in user_index:
+                user_index[userid] = i
+
+        # users without a row get one (zero initialized as with setAcl)
+        # after the existing rows
+        num_new = 0
+        for acl in acls:
+            if acl['userid'] not in user_index:
+                user_index[acl['userid']] = num_acls + num_new
+                num_new += 1
+        arr = np.concatenate((arr, np.zeros((num_new,), dtype=dt)))
+        for acl in acls:
+            row = user_index[acl['userid']]
+            for field in acl.keys():
+                arr[field][row] = acl[field]
+
+        if num_new:
+            acl_dset.resize((num_acls + num_new,))
+        acl_dset[...] = arr  # save back to the file
+        self._acls.pop(obj_uuid, None)
 
     def initFile(self):
         # self.log.info("initFile")
+        if self._write_buffers:
+            # every call into the db writes buffers older than max_age
+            self._flushWriteBuffers(expired_only=True)
+        if self._timestamps_dirty_time is not None and self.timestamp_max_age is not None and \
+                time.time() - self._timestamps_dirty_time >= self.timestamp_max_age:
+            self._flushTimeStamps()  # likewise for changed timestamps
         if self.readonly:
             self.dbGrp = self.dbf
             if "{groups}" in self.dbf:
@@ -553,13 +951,17 @@ class Hdf5db:
         self.dbGrp.create_group("{datasets}")
         self.dbGrp.create_group("{datatypes}")
         self.dbGrp.create_group("{addr}") # store object address
-        self.dbGrp.create_group("{ctime}") # stores create timestamps
-        self.dbGrp.create_group("{mtime}") # store modified timestamps
 
         mtime = op.getmtime(self.f.filename)
         ctime = mtime
         self.setCreateTime(self.root_uuid, timestamp=ctime)
         self.setModifiedTime(self.root_uuid, timestamp=mtime)
+        # timestamps are kept in {timestamps}, these groups (with just the
+        # root timestamps older versions fall back to) let older versions
+        # open the file
+        for (grp_name, timestamp) in (("{ctime}", ctime), ("{mtime}", mtime)):
+            grp = self.dbGrp.create_group(grp_name)
+            grp.attrs.create(self.root_uuid, int(timestamp), dtype='int64')
 
         self.f.visititems(visitObj)
 
@@ -614,7 +1016,7 @@ class Hdf5db:
             raise IOError(errno.EIO, msg)
 
         # fill in Filter class values
-        if 'filters' in prop_list:
+        if 'filters' in prop_list and prop_list['filters'] != "auto":
             prop_filters = prop_list['filters']
             for prop_filter in prop_filters:
                 if 'class' not in prop_filter:
@@ -760,10 +1162,554 @@ class Hdf5db:
         self.initFile()
         self.log.info("getDatasetObjByUuid(" + obj_uuid + ")")
 
-        obj = self.getObjectByUuid("datasets", obj_uuid)
+        obj = self._getDatasetObj(obj_uuid)
+        if obj is not None and obj_uuid in self._write_buffers:
+            self._flushWriteBuffer(obj_uuid)
 
         return obj
 
+    """
+      _syncExtent - trim space reserved by appends if the selection reaches
+        past the appended data.  The default selection (Ellipsis) is used by
+        methods that use the extent of the dataset.
+    """
+    def _syncExtent(self, obj_uuid, slices=Ellipsis):
+        lengths = self._getAppendLengths()
+        if obj_uuid not in lengths:
+            return
+        (axis, length) = lengths[obj_uuid]
+        if type(slices) in (list, tuple) and axis < len(slices):
+            s = slices[axis]
+            if type(s) is slice:
+                if s.start is not None and s.stop is not None and \
+                        0 <= s.start and s.stop <= length:
+                    return  # within the appended data
+            elif isinstance(s, six.integer_types + (np.integer,)) and 0 <= s < length:
+                return
+        self._trimAppendedDataset(obj_uuid)
+
+    def _getDatasetObj(self, obj_uuid):
+        if obj_uuid in self._datasets:
+            # move to end of LRU order
+            obj = self._datasets.pop(obj_uuid)
+            self._datasets[obj_uuid] = obj
+            return obj
+
+        return self._openDataset(obj_uuid)
+
+    """
+      _openDataset - open dataset by uuid.  Chunked datasets are opened
+        with the chunk cache settings for the dataset (if any) and kept open
+        so that the chunk cache is preserved between calls.
+    """
+    def _openDataset(self, obj_uuid):
+        dset = self.getObjectByUuid("datasets", obj_uuid)
+        if dset is None or not dset.chunks:
+            return dset
+
+        cache = self._getChunkCacheSettings(obj_uuid, dset)
+        if cache is not None and dset.name:
+            # access properties are only used if the dataset is not already
+            # open, so close our handle and re-open by name
+            name = dset.name
+            dset = None
+            if six.PY3:
+                name = name.encode('utf-8')
+            (nslots, nbytes, w0) = cache
+            dapl = h5py.h5p.create(h5py.h5p.DATASET_ACCESS)
+            dapl.set_chunk_cache(nslots, nbytes, w0)
+            dset = h5py.Dataset(h5py.h5d.open(self.f.id, name, dapl=dapl))
+
+        self._datasets[obj_uuid] = dset
+        if len(self._datasets) > _MAX_OPEN_DATASETS:
+            self._datasets.popitem(last=False)
+        return dset
+
+    """
+      _getChunkCacheSettings - return (nslots, nbytes, w0) for the chunk cache
+        of the given dataset, or None to use the file defaults
+    """
+    def _getChunkCacheSettings(self, obj_uuid, dset):
+        if obj_uuid in self._chunk_cache:
+            return self._chunk_cache[obj_uuid]
+        if not self.auto_chunk_cache:
+            return None
+        # size the cache to hold one row of chunks
+        num_chunks = 1
+        for dim in range(1, len(dset.shape)):
+            num_chunks *= -(-dset.shape[dim] // dset.chunks[dim])
+        nbytes = self._getChunkBytes(dset) * num_chunks
+        nbytes = min(nbytes, _MAX_AUTO_CHUNK_CACHE)
+        (_, _, default_nbytes, w0) = self.f.id.get_access_plist().get_cache()
+        if nbytes <= default_nbytes:
+            return None
+        return self._makeChunkCacheSettings(dset, nbytes, w0=w0)
+
+    def _getChunkBytes(self, dset):
+        chunk_bytes = dset.dtype.itemsize
+        for extent in dset.chunks:
+            chunk_bytes *= extent
+        return chunk_bytes
+
+    def _makeChunkCacheSettings(self, dset, nbytes, nslots=None, w0=None):
+        if nslots is None:
+            # HDF5 recommends about 100 hash slots per chunk that fits in the cache
+            nslots = max(521, 100 * (nbytes // self._getChunkBytes(dset))) | 1
+        if w0 is None:
+            w0 = 0.75
+        return (nslots, nbytes, w0)
+
+    """
+      setDatasetChunkCache - set the chunk cache settings for the given dataset.
+        The settings take effect the next time the dataset is opened (i.e. once
+        any handles to the dataset returned earlier are released).
+    """
+    def setDatasetChunkCache(self, obj_uuid, nbytes, nslots=None, w0=None):
+        dset = self.getDatasetObjByUuid(obj_uuid)
+        if dset is None:
+            msg = "Dataset: " + obj_uuid + " not found"
+            self.log.info(msg)
+            raise IOError(errno.ENXIO, msg)
+        if not dset.chunks:
+            msg = "Chunk cache can only be set for chunked datasets"
+            self.log.info(msg)
+            raise IOError(errno.EINVAL, msg)
+        if nbytes < 0 or (w0 is not None and (w0 < 0.0 or w0 > 1.0)):
+            msg = "invalid chunk cache settings"
+            self.log.info(msg)
+            raise IOError(errno.EINVAL, msg)
+        self._chunk_cache[obj_uuid] = self._makeChunkCacheSettings(dset, nbytes, nslots=nslots, w0=w0)
+        dset = None
+        self._datasets.pop(obj_uuid, None)  # re-open with new settings
+
+    """
+      getDatasetChunkCache - return dict with the chunk cache settings in use
+        for the given dataset
+    """
+    def getDatasetChunkCache(self, obj_uuid):
+        dset = self.getDatasetObjByUuid(obj_uuid)
+        if dset is None:
+            msg = "Dataset: " + obj_uuid + " not found"
+            self.log.info(msg)
+            raise IOError(errno.ENXIO, msg)
+        (nslots, nbytes, w0) = dset.id.get_access_plist().get_chunk_cache()
+        return {'nslots': nslots, 'nbytes': nbytes, 'w0': w0}
+
+    """
+      _tuneChunkCache - with auto_chunk_cache, grow the chunk cache of the
+        dataset if the given selection touches more chunks than fit in it
+    """
+    def _tuneChunkCache(self, obj_uuid, dset, slices):
+        if not self.auto_chunk_cache or not dset.chunks:
+            return
+        try:
+            selection = self._getSelectionSlices(dset, slices)
+        except IOError:
+            return  # let the read report the error
+        num_chunks = 1
+        for dim in range(len(selection)):
+            num_chunks *= len(self._getChunkPlan(selection[dim], dset.chunks[dim]))
+        nbytes = min(num_chunks * self._getChunkBytes(dset), _MAX_AUTO_CHUNK_CACHE)
+        (_, cache_nbytes, w0) = dset.id.get_access_plist().get_chunk_cache()
+        if nbytes > cache_nbytes:
+            self.log.info("growing chunk cache to: " + str(nbytes) + " for dataset: " + obj_uuid)
+            self._chunk_cache[obj_uuid] = self._makeChunkCacheSettings(dset, nbytes, w0=w0)
+            self._datasets.pop(obj_uuid, None)  # re-open with new settings
+
+    """
+     _getChunkOffset: validate that offset is the first element of a chunk
+        of the dataset and return it as a tuple
+    """
+    def _getChunkOffset(self, dset, offset, caller):
+        if not dset.chunks:
+            msg = caller + ": dataset is not chunked"
+            self.log.info(msg)
+            raise IOError(errno.EINVAL, msg)
+        if type(offset) not in (list, tuple) or len(offset) != len(dset.shape):
+            msg = caller + ": chunk offset must have one index per dimension"
+            self.log.info(msg)
+            raise IOError(errno.EINVAL, msg)
+        for dim in range(len(offset)):
+            index = offset[dim]
+            if not isinstance(index, six.integer_types) or index < 0:
+                msg = caller + ": invalid chunk offset: " + str(offset)
+                self.log.info(msg)
+                raise IOError(errno.EINVAL, msg)
+            if index % dset.chunks[dim] != 0:
+                msg = caller + ": offset doesn't fall on a chunk boundary: " + str(offset)
+                self.log.info(msg)
+                raise IOError(errno.EINVAL, msg)
+            if index >= dset.shape[dim]:
+                msg = caller + ": chunk offset out of range: " + str(offset)
+                self.log.info(msg)
+                raise IOError(errno.EINVAL, msg)
+        return tuple(offset)
+
+    """
+      getDatasetChunkOffsetsByUuid - return list of the offsets of the chunks
+        that have been written for the given chunked dataset
+    """
+    def getDatasetChunkOffsetsByUuid(self, obj_uuid):
+        dset = self.getDatasetObjByUuid(obj_uuid)
+        self._syncExtent(obj_uuid)
+        if dset is None:
+            msg = "Dataset: " + obj_uuid + " not found"
+            self.log.info(msg)
+            raise IOError(errno.ENXIO, msg)
+        if not dset.chunks:
+            msg = "getDatasetChunkOffsetsByUuid: dataset is not chunked"
+            self.log.info(msg)
+            raise IOError(errno.EINVAL, msg)
+        if not hasattr(dset.id, 'get_chunk_info'):
+            msg = "getDatasetChunkOffsetsByUuid: not supported by this version of h5py"
+            self.log.info(msg)
+            raise IOError(errno.ENOSYS, msg)
+        offsets = []
+        for i in range(dset.id.get_num_chunks()):
+            offsets.append(dset.id.get_chunk_info(i).chunk_offset)
+        return offsets
+
+    """
+      getDatasetChunkByUuid - return the stored (i.e. still compressed) bytes
+        of the chunk starting at offset, as a tuple of (filter_mask, data).
+        Bits set in filter_mask mark filters that were skipped for the chunk.
+    """
+    def getDatasetChunkByUuid(self, obj_uuid, offset):
+        dset = self.getDatasetObjByUuid(obj_uuid)
+        self._syncExtent(obj_uuid)
+        if dset is None:
+            msg = "Dataset: " + obj_uuid + " not found"
+            self.log.info(msg)
+            raise IOError(errno.ENXIO, msg)
+        offset = self._getChunkOffset(dset, offset, "getDatasetChunkByUuid")
+        if not hasattr(dset.id, 'read_direct_chunk'):
+            msg = "getDatasetChunkByUuid: not supported by this version of h5py"
+            self.log.info(msg)
+            raise IOError(errno.ENOSYS, msg)
+        try:
+            (filter_mask, data) = dset.id.read_direct_chunk(offset)
+        except (IOError, OSError, RuntimeError) as e:
+            # chunk hasn't been written
+            msg = "getDatasetChunkByUuid: unable to read chunk " + str(offset) + ": " + str(e)
+            self.log.info(msg)
+            raise IOError(errno.ENXIO, msg)
+        return (filter_mask, data)
+
+    """
+      setDatasetChunkByUuid - write already filtered (e.g. compressed) bytes
+        as the chunk starting at offset.  The data must have been encoded with
+        the dataset's filter pipeline, less any filters flagged in filter_mask.
+    """
+    def setDatasetChunkByUuid(self, obj_uuid, offset, data, filter_mask=0):
+        self.initFile()
+        if self.readonly:
+            msg = "Unable to write dataset chunk (Updates are not allowed)"
+            self.log.info(msg)
+            raise IOError(errno.EPERM, msg)
+        dset = self.getDatasetObjByUuid(obj_uuid)
+        self._syncExtent(obj_uuid)
+        if dset is None:
+            msg = "Dataset: " + obj_uuid + " not found"
+            self.log.info(msg)
+            raise IOError(errno.ENXIO, msg)
+        offset = self._getChunkOffset(dset, offset, "setDatasetChunkByUuid")
+        if not hasattr(dset.id, 'write_direct_chunk'):
+            msg = "setDatasetChunkByUuid: not supported by this version of h5py"
+            self.log.info(msg)
+            raise IOError(errno.ENOSYS, msg)
+        if not isinstance(data, (bytes, bytearray, memoryview)) or len(data) == 0:
+            msg = "setDatasetChunkByUuid: data must be a non-empty bytes object"
+            self.log.info(msg)
+            raise IOError(errno.EINVAL, msg)
+        if obj_uuid in self._getAutoFilterDatasets():
+            dset = self._resolveAutoFilters(obj_uuid, dset, None)
+        dset.id.write_direct_chunk(offset, bytes(data), filter_mask)
+
+        self._invalidateValueCache(obj_uuid)
+
+        # update modified time
+        self.setModifiedTime(obj_uuid)
+
+    """
+     _getParallelFilters: return list of (filter_id, options) for the dataset
+        filter pipeline if chunks of the dataset can be encoded and decoded
+        outside of HDF5, otherwise None
+    """
+    def _getParallelFilters(self, dset):
+        if not self.chunk_threads or self.chunk_threads < 2 or not dset.chunks:
+            return None
+        if not hasattr(dset.id, 'write_direct_chunk'):
+            return None  # requires h5py 2.6 or later
+        dt = dset.dtype
+        if dt.hasobject or len(dt) > 0 or dt.kind not in 'biufS':
+            return None
+        if dset.id.get_type().get_size() != dt.itemsize:
+            return None
+        plist = dset.id.get_create_plist()
+        filters = []
+        for n in range(plist.get_nfilters()):
+            filter_info = plist.get_filter(n)
+            if filter_info[0] not in _PARALLEL_CHUNK_FILTERS:
+                return None
+            filters.append((filter_info[0], filter_info[2]))
+        if not filters:
+            return None
+        return filters
+
+    def _getChunkPool(self):
+        if self._chunk_pool is None:
+            self._chunk_pool = ThreadPool(self.chunk_threads)
+        return self._chunk_pool
+
+    """
+     _encodeChunk: apply the filter pipeline to the given chunk array
+    """
+    def _encodeChunk(self, filters, chunk):
+        buf = chunk.tobytes()
+        for (filter_id, opts) in filters:
+            if filter_id == 1:
+                level = 6
+                if opts:
+                    level = opts[0]
+                buf = zlib.compress(buf, level)
+            else:
+                elem_size = chunk.dtype.itemsize
+                if opts:
+                    elem_size = opts[0]
+                buf = _shuffleBytes(buf, elem_size)
+        return buf
+
+    """
+     _decodeChunk: undo the filter pipeline for the given chunk bytes,
+        skipping filters flagged in filter_mask
+    """
+    def _decodeChunk(self, filters, filter_mask, data, dtype):
+        buf = data
+        for n in reversed(range(len(filters))):
+            if filter_mask & (1 << n):
+                continue  # filter wasn't applied to this chunk
+            (filter_id, opts) = filters[n]
+            if filter_id == 1:
+                buf = zlib.decompress(buf)
+            else:
+                elem_size = dtype.itemsize
+                if opts:
+                    elem_size = opts[0]
+                buf = _unshuffleBytes(buf, elem_size)
+        return np.frombuffer(buf, dtype=dtype)
+
+    """
+     _readParallel: read the selection by fetching the raw chunks and
+        decompressing them in the chunk_threads pool.  Returns None if the
+        dataset filters or the selection don't allow this.
+    """
+    def _readParallel(self, dset, slices):
+        filters = self._getParallelFilters(dset)
+        if filters is None or not hasattr(dset.id, 'read_direct_chunk'):
+            return None
+        try:
+            selection = self._getSelectionSlices(dset, slices)
+            shape = self._getSelectionShape(dset, slices)
+        except (IOError, TypeError):
+            return None  # let the h5py read report the error
+        plans = []
+        num_chunks = 1
+        for dim in range(len(selection)):
+            plan = self._getChunkPlan(selection[dim], dset.chunks[dim])
+            plans.append(plan)
+            num_chunks *= len(plan)
+        if num_chunks < 2:
+            return None  # nothing to gain
+
+        counts = tuple(len(range(s.start, s.stop, s.step)) for s in selection)
+        dtype = dset.dtype
+        chunks = dset.chunks
+        out = np.empty(counts, dtype=dtype)
+        steps = tuple(slice(None, None, s.step) for s in selection)
+
+        def decode(filter_mask, data, src_sel, des_sel):
+            chunk = self._decodeChunk(filters, filter_mask, data, dtype)
+            out[des_sel] = chunk.reshape(chunks)[src_sel][steps]
+
+        self.log.info("parallel read of " + str(num_chunks) + " chunks")
+        pool = self._getChunkPool()
+        results = []
+        # HDF5 calls stay on this thread, only the decoding is parallel
+        for items in itertools.product(*plans):
+            offset = []
+            for dim in range(len(items)):
+                chunk_extent = dset.chunks[dim]
+                offset.append((items[dim][0] // chunk_extent) * chunk_extent)
+            src_sel = tuple(slice(items[dim][0] - offset[dim], items[dim][1] - offset[dim])
+                            for dim in range(len(items)))
+            des_sel = tuple(slice(item[2], item[2] + item[3]) for item in items)
+            try:
+                (filter_mask, data) = dset.id.read_direct_chunk(tuple(offset))
+            except (IOError, OSError, RuntimeError):
+                out[des_sel] = dset.fillvalue  # chunk hasn't been written
+                continue
+            results.append(pool.apply_async(decode, (filter_mask, data, src_sel, des_sel)))
+        try:
+            for result in results:
+                result.get()
+        except (zlib.error, ValueError) as e:
+            self.log.warning("parallel read failed, using h5py: " + str(e))
+            return None
+        return out.reshape(shape)
+
+    """
+     _writeParallel: write arr to the selection as chunks compressed by the
+        chunk_threads pool.  Returns False (without writing anything) if the
+        dataset filters or the selection don't allow this.
+    """
+    def _writeParallel(self, dset, slices, arr):
+        filters = self._getParallelFilters(dset)
+        if filters is None:
+            return False
+        rank = len(dset.shape)
+        if rank == 0 or len(slices) != rank:
+            return False
+        chunk_starts = []
+        shape = []
+        for dim in range(rank):
+            s = slices[dim]
+            chunk_extent = dset.chunks[dim]
+            if type(s) is not slice or s.step not in (None, 1):
+                return False
+            if s.start % chunk_extent != 0:
+                return False
+            if s.stop % chunk_extent != 0 and s.stop != dset.shape[dim]:
+                return False
+            chunk_starts.append(range(s.start, s.stop, chunk_extent))
+            shape.append(s.stop - s.start)
+        chunk_offsets = list(itertools.product(*chunk_starts))
+        if len(chunk_offsets) < 2:
+            return False  # nothing to gain
+        shape = tuple(shape)
+        if arr.shape != shape:
+            if arr.size != np.prod(shape):
+                return False  # let h5py broadcast or report the error
+            arr = arr.reshape(shape)
+        dtype = dset.dtype
+        chunks = dset.chunks
+        arr = np.asarray(arr, dtype=dtype)
+        fillvalue = dset.fillvalue
+
+        def encode(offset):
+            region = []
+            partial = False
+            for dim in range(rank):
+                start = offset[dim] - slices[dim].start
+                stop = min(start + chunks[dim], shape[dim])
+                region.append(slice(start, stop))
+                if stop - start != chunks[dim]:
+                    partial = True
+            region = tuple(region)
+            if partial:
+                # edge chunks are stored full size, padded with the fill value
+                chunk = np.empty(chunks, dtype=dtype)
+                chunk[...] = fillvalue
+                chunk[tuple(slice(0, r.stop - r.start) for r in region)] = arr[region]
+            else:
+                chunk = np.ascontiguousarray(arr[region])
+            is_fill = fill_bytes is not None and self._isFillBlock(chunk, fill_bytes)
+            return (offset, self._encodeChunk(filters, chunk), is_fill)
+
+        fill_bytes = self._getSparseFillBytes(dset)
+        self.log.info("parallel write of " + str(len(chunk_offsets)) + " chunks")
+        pool = self._getChunkPool()
+        # HDF5 calls stay on this thread, only the encoding is parallel
+        for (offset, data, is_fill) in pool.imap(encode, chunk_offsets):
+            if is_fill and not self._isChunkAllocated(dset, offset):
+                continue  # leave unallocated
+            dset.id.write_direct_chunk(offset, data)
+        return True
+
+    """
+     _getSparseFillBytes: with sparse_writes, return the bytes of the
+        dataset fill value if unallocated chunks of the dataset read as the
+        fill value, otherwise None
+    """
+    def _getSparseFillBytes(self, dset):
+        if not self.sparse_writes or not dset.chunks:
+            return None
+        dt = dset.dtype
+        if dt.hasobject or dt.shape != ():
+            return None
+        if not hasattr(dset.id, 'get_chunk_info_by_coord'):
+            return None  # requires h5py 3.0 or later
+        if dset.id.get_create_plist().get_fill_time() == h5py.h5d.FILL_TIME_NEVER:
+            return None
+        return np.array(dset.fillvalue, dtype=dt).tobytes()
+
+    def _isFillBlock(self, block, fill_bytes):
+        # compare bytes so NaN fill values match
+        block = np.ascontiguousarray(block)
+        if block.size == 0:
+            return True
+        elements = block.reshape(-1).view(np.uint8).reshape(block.size, len(fill_bytes))
+        return bool((elements == np.frombuffer(fill_bytes, dtype=np.uint8)).all())
+
+    def _isChunkAllocated(self, dset, offset):
+        return dset.id.get_chunk_info_by_coord(tuple(offset)).byte_offset is not None
+
+    """
+     _writeSparse: write arr to the (unit-stride) selection, skipping chunks
+        that aren't allocated and would only get the fill value.  Each of the
+        other chunks is written with its own hyperslab selection (OR-ing the
+        hyperslabs into one selection is quadratic in the number of chunks).
+        Returns False (without writing anything) if there are no chunks to
+        skip.
+    """
+    def _writeSparse(self, dset, slices, arr):
+        fill_bytes = self._getSparseFillBytes(dset)
+        if fill_bytes is None:
+            return False
+        rank = len(dset.shape)
+        if rank == 0 or len(slices) != rank:
+            return False
+        plans = []
+        counts = []
+        for dim in range(rank):
+            s = slices[dim]
+            if type(s) is not slice or s.step not in (None, 1):
+                return False
+            plans.append(self._getChunkPlan(slice(s.start, s.stop, 1), dset.chunks[dim]))
+            counts.append(s.stop - s.start)
+        counts = tuple(counts)
+        if arr.shape != counts:
+            if arr.size != np.prod(counts):
+                return False  # let h5py broadcast or report the error
+            arr = arr.reshape(counts)
+        arr = np.ascontiguousarray(arr, dtype=dset.dtype)
+
+        blocks = []
+        skipped = 0
+        for items in itertools.product(*plans):
+            des_sel = tuple(slice(item[2], item[2] + item[3]) for item in items)
+            if self._isFillBlock(arr[des_sel], fill_bytes):
+                offset = tuple((items[dim][0] // dset.chunks[dim]) * dset.chunks[dim]
+                               for dim in range(rank))
+                if not self._isChunkAllocated(dset, offset):
+                    skipped += 1
+                    continue
+            blocks.append(items)
+        if skipped == 0:
+            return False
+        self.log.info("sparse write, skipping " + str(skipped) + " fill value chunks")
+        if not blocks:
+            return True
+
+        fspace = dset.id.get_space()
+        mspace = h5py.h5s.create_simple(counts)
+        mtype = h5py.h5t.py_create(dset.dtype)
+        for items in blocks:
+            count = tuple(item[3] for item in items)
+            fspace.select_hyperslab(tuple(item[0] for item in items), count, op=h5py.h5s.SELECT_SET)
+            mspace.select_hyperslab(tuple(item[2] for item in items), count, op=h5py.h5s.SELECT_SET)
+            dset.id.write(mspace, fspace, arr, mtype=mtype)
+        return True
+
     def getGroupObjByUuid(self, obj_uuid):
         self.initFile()
         self.log.info("getGroupObjByUuid(" + obj_uuid + ")")
@@ -926,6 +1872,8 @@ class Hdf5db:
                 if filter_id in _HDF_FILTERS:
                     hdf_filter = _HDF_FILTERS[filter_id]
                     filter_prop['class'] = hdf_filter['class']
+                    if hdf_filter.get('plugin') and opt_values:
+                        filter_prop['parameters'] = list(opt_values)
                     if 'options' in hdf_filter:
                         filter_opts = hdf_filter['options']
                         for i in range(len(filter_opts)):
@@ -957,6 +1905,7 @@ class Hdf5db:
     #
     def getDatasetItemByUuid(self, obj_uuid):
         dset = self.getDatasetObjByUuid(obj_uuid)
+        self._syncExtent(obj_uuid)
         if dset is None:
             if self.getModifiedTime(obj_uuid, useRoot=False):
                 msg = "Dataset with uuid: " + obj_uuid + " has been previously deleted"
@@ -2084,11 +3033,21 @@ class Hdf5db:
     Get values from dataset identified by obj_uuid.
     If a slices list or tuple is provided, it should have the same
     number of elements as the rank of the dataset.
+    format "binary" returns the values as bytes; format "buffer" returns
+    a memoryview of the bytes without copying the values read.  If out
+    (a writable buffer-protocol object) is given with format "buffer", the
+    values are read directly into out.
     """
-    def getDatasetValuesByUuid(self, obj_uuid, slices=Ellipsis, format="json"):
+    def getDatasetValuesByUuid(self, obj_uuid, slices=Ellipsis, format="json", out=None):
         dset = self.getDatasetObjByUuid(obj_uuid)
-        if format not in ("json", "binary"):
-            msg = "only json and binary formats are supported"
+        self._syncExtent(obj_uuid, slices)
+        if format not in ("json", "binary", "buffer"):
+            msg = "only json, binary, and buffer formats are supported"
+            self.log.info(msg)
+            raise IOError(errno.EINVAL, msg)
+
+        if out is not None and format != "buffer":
+            msg = "out parameter can only be used with buffer format"
             self.log.info(msg)
             raise IOError(errno.EINVAL, msg)
             
@@ -2101,7 +3060,7 @@ class Hdf5db:
         dt = dset.dtype
         typeItem = getTypeItem(dt)
         itemSize = getItemSize(typeItem)
-        if itemSize == "H5T_VARIABLE" and format == "binary":
+        if itemSize == "H5T_VARIABLE" and format != "json":
             msg = "Only JSON is supported for for this data type"
             self.log.info(msg)
             raise IOError(errno.EINVAL, msg)
@@ -2111,6 +3070,8 @@ class Hdf5db:
             return None   
                
         rank = len(dset.shape)
+
+        self._tuneChunkCache(obj_uuid, dset, slices)
          
         if rank == 0:
             # check for null dataspace
@@ -2131,6 +3092,13 @@ class Hdf5db:
             msg = "Unexpected error: getDatasetValuesByUuid: number of dims in selection not same as rank"
             self.log.error(msg)
             raise IOError(errno.EIO, msg)
+
+        cache_key = None
+        if self.value_cache_bytes and format != "buffer":
+            cache_key = self._getValueCacheKey(obj_uuid, dset, slices, format)
+            values = self._getCachedValues(cache_key)
+            if values is not None:
+                return values
        
         if dt.kind == 'O':
             if format != "json":
@@ -2168,15 +3136,17 @@ class Hdf5db:
                 self.log.info(msg)
                 raise IOError(errno.EINVAL, msg)
             values = self.bytesArrayToList(dset[slices])
+        elif format == "buffer":
+            values = self._getDatasetBuffer(dset, slices, out=out)
         elif len(dt) > 1:
             # compound type
             if format == "json":
-                values = self.bytesArrayToList(dset[slices])
+                values = self.bytesArrayToList(self._readDatasetValues(dset, slices))
             else:
-                values = dset[slices].tobytes()
+                values = self._readDatasetValues(dset, slices).tobytes()
             
         else:
-            values = dset[slices]
+            values = self._readDatasetValues(dset, slices)
             
             # just use tolist to dump
             if format == "json":             
@@ -2184,43 +3154,450 @@ class Hdf5db:
             else:
                 #values = base64.b64encode(dset[slices].tobytes())
                 values = values.tobytes()
+
+        if cache_key is not None:
+            self._setCachedValues(cache_key, values)
             
         return values
-        
+
     """
-      doDatasetQueryByUuid: return rows based on query string
-        Return rows from a dataset that matches query string.
+     _getValueCacheKey: return key for the value cache, or None if the
+        selection can't be cached
+    """
+    def _getValueCacheKey(self, obj_uuid, dset, slices, format):
+        if slices is Ellipsis:
+            slices = ()
+        elif type(slices) not in (list, tuple):
+            return None
+        key = [obj_uuid, format]
+        for dim in range(len(dset.shape)):
+            s = slice(None)
+            if dim < len(slices):
+                s = slices[dim]
+            if type(s) is slice:
+                key.append(s.indices(dset.shape[dim]))
+            elif s is Ellipsis:
+                key.append(slice(None).indices(dset.shape[dim]))
+            elif isinstance(s, six.integer_types):
+                key.append(s)
+            else:
+                return None
+        return tuple(key)
+
+    """
+     _getCachedValues: return cached values for key, or None if not cached
+        or the dataset has been modified since the values were cached
+    """
+    def _getCachedValues(self, key):
+        if key is None or key not in self._value_cache:
+            return None
+        (mtime, values, nbytes) = self._value_cache.pop(key)
+        if self.update_timestamps and mtime != self.getModifiedTime(key[0]):
+            self._removeCachedValues(key, nbytes)
+            return None
+        self._value_cache[key] = (mtime, values, nbytes)  # most recently used
+        if key[1] == "json":
+            values = json.loads(values)
+        return values
+
+    """
+     _setCachedValues: add values to the cache, evicting least recently used
+        entries to stay within value_cache_bytes.  json values are stored
+        encoded, so callers can't modify the cached copy.
+    """
+    def _setCachedValues(self, key, values):
+        if key[1] == "json":
+            try:
+                values = json.dumps(values)
+            except (TypeError, ValueError):
+                return  # not serializable, don't cache
+        nbytes = len(values)
+        if nbytes > self.value_cache_bytes:
+            return
+        mtime = None
+        if self.update_timestamps:
+            mtime = self.getModifiedTime(key[0])
+        if key in self._value_cache:
+            self._removeCachedValues(key, self._value_cache.pop(key)[2])
+        while self._value_cache and self._value_cache_size + nbytes > self.value_cache_bytes:
+            (lru_key, item) = self._value_cache.popitem(last=False)
+            self._removeCachedValues(lru_key, item[2])
+        self._value_cache[key] = (mtime, values, nbytes)
+        self._value_cache_keys.setdefault(key[0], set()).add(key)
+        self._value_cache_size += nbytes
+
+    def _removeCachedValues(self, key, nbytes):
+        # key has already been popped from _value_cache
+        self._value_cache_size -= nbytes
+        keys = self._value_cache_keys.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._value_cache_keys[key[0]]
+
+    """
+     _invalidateValueCache: remove any cached values for the given dataset
+    """
+    def _invalidateValueCache(self, obj_uuid):
+        self._memmap_flush = True  # called for every dataset write
+        for key in self._value_cache_keys.pop(obj_uuid, ()):
+            (mtime, values, nbytes) = self._value_cache.pop(key)
+            self._value_cache_size -= nbytes
         
-        Note: Only supported for compound_type/one-dimensional datasets
     """
-    def doDatasetQueryByUuid(self, obj_uuid, query, start=0, stop=-1, step=1, limit=None):
-        self.log.info("doQueryByUuid - uuid: " + obj_uuid + " query:" + query)
-        self.log.info("start: " + str(start) + " stop: " + str(stop) + " step: " + str(step) + " limit: " + str(limit))
-        dset = self.getDatasetObjByUuid(obj_uuid)   
-        if dset is None:
-            msg = "Dataset: " + obj_uuid + " not found"
-            self.log.info(msg)
+     _readDatasetValues: read selected values as a numpy array, using a
+        memory map for large selections of contiguous datasets (with
+        memmap_reads) and the chunk read planner for strided selections of
+        chunked datasets.
+    """
+    def _readDatasetValues(self, dset, slices):
+        if type(slices) is list:
+            slices = tuple(slices)
+        values = self._getMemmapRead(dset, slices)
+        if values is not None:
+            return values
+        values = self._readParallel(dset, slices)
+        if values is not None:
+            return values
+        if self._usePlannedRead(dset, slices):
+            shape = self._getSelectionShape(dset, slices)
+            values = np.empty(shape, dtype=dset.dtype)
+            self._readPlanned(dset, slices, values)
+            return values
+        return dset[slices]
+
+    """
+     _usePlannedRead: return True if the selection should be read chunk by chunk
+
+        HDF5 copies strided selections out of each chunk element by element,
+        so for strided reads of chunked datasets it's faster to read the
+        unit-stride bounding box of the selection within each chunk (one read
+        per touched chunk) and subsample with numpy.  The plain read is used
+        for unit-stride selections and when the estimated number of chunks
+        touched is too large for per-chunk reads to pay off.
+    """
+    def _usePlannedRead(self, dset, slices):
+        if not dset.chunks or dset.dtype.hasobject:
+            return False
+        if type(slices) not in (list, tuple) or len(slices) != len(dset.shape):
+            return False
+        for s in slices:
+            if type(s) is not slice:
+                return False  # only hyperslabs are planned
+        selection = self._getSelectionSlices(dset, slices)
+        if max(s.step for s in selection) == 1:
+            return False
+        num_chunks = 1
+        for dim in range(len(selection)):
+            num_chunks *= len(self._getChunkPlan(selection[dim], dset.chunks[dim]))
+        self.log.info("planned read, chunks touched: " + str(num_chunks))
+        return 0 < num_chunks <= _MAX_PLANNED_CHUNKS
+
+    """
+     _getChunkPlan: return list of (first, last, out_start, count) tuples for each
+        chunk touched by the slice s, where first:last is the unit-stride range
+        to read from the chunk and out_start:out_start+count the output range.
+    """
+    def _getChunkPlan(self, s, chunk_extent):
+        plan = []
+        index = s.start
+        while index < s.stop:
+            chunk_end = min(((index // chunk_extent) + 1) * chunk_extent, s.stop)
+            count = len(range(index, chunk_end, s.step))
+            last = index + (count - 1) * s.step + 1
+            plan.append((index, last, (index - s.start) // s.step, count))
+            index += count * s.step
+        return plan
+
+    """
+     _readPlanned: read selection into out with one read per chunk touched
+    """
+    def _readPlanned(self, dset, slices, out):
+        selection = self._getSelectionSlices(dset, slices)
+        plans = []
+        for dim in range(len(selection)):
+            plans.append(self._getChunkPlan(selection[dim], dset.chunks[dim]))
+        steps = tuple(slice(None, None, s.step) for s in selection)
+        for items in itertools.product(*plans):
+            src_sel = tuple(slice(item[0], item[1]) for item in items)
+            des_sel = tuple(slice(item[2], item[2] + item[3]) for item in items)
+            out[des_sel] = dset[src_sel][steps]
+
+    """
+     _getDatasetBuffer: return a flat memoryview of the bytes of the selected values.
+        If out is given, the values are read into out, otherwise into a new array.
+    """
+    def _getDatasetBuffer(self, dset, slices, out=None):
+        if type(slices) is list:
+            slices = tuple(slices)
+        if out is None:
+            values = self._readDatasetValues(dset, slices)
+            # no copy if values is already contiguous (e.g. a memmap)
+            values = np.ascontiguousarray(values)
+            return memoryview(values.reshape(-1).view(np.uint8))
+
+        shape = self._getSelectionShape(dset, slices)
+        nbytes = dset.dtype.itemsize
+        for extent in shape:
+            nbytes *= extent
+        try:
+            arr = np.frombuffer(out, dtype=np.uint8)
+        except (TypeError, ValueError) as e:
+            msg = "out parameter is not a contiguous buffer: " + str(e)
+            self.log.info(msg)
+            raise IOError(errno.EINVAL, msg)
+        if len(arr) < nbytes or not arr.flags['WRITEABLE']:
+            msg = "out parameter must be a writable buffer of at least " + str(nbytes) + " bytes"
+            self.log.info(msg)
+            raise IOError(errno.EINVAL, msg)
+        arr = arr[:nbytes]
+        if nbytes > 0:
+            des = arr.view(dset.dtype).reshape(shape)
+            values = self._getMemmapRead(dset, slices)
+            if values is None and self._usePlannedRead(dset, slices):
+                self._readPlanned(dset, slices, des)
+            elif values is not None:
+                des[...] = values  # copy from the memory map
+            elif slices is Ellipsis:
+                dset.read_direct(des)
+            else:
+                dset.read_direct(des, source_sel=slices)
+        return memoryview(arr)
+
+    """
+    streamDatasetBytesByUuid - return a generator that yields the selected values
+      of the dataset as consecutive blocks of little-endian bytes in C order.
+      Each block is at most block_bytes (or a single element if larger):
+      blocks take the full extent of the trailing dimensions when they fit,
+      otherwise the innermost dimension that doesn't fit is split, aligned
+      with the chunk layout where possible.  Memory use does not depend on
+      the size of the selection.  Each block is a memoryview of the bytes.
+    """
+    def streamDatasetBytesByUuid(self, obj_uuid, slices=Ellipsis, block_bytes=_STREAM_BLOCK_BYTES):
+        dset = self.getDatasetObjByUuid(obj_uuid)
+        self._syncExtent(obj_uuid, slices)
+        if dset is None:
+            msg = "Dataset: " + obj_uuid + " not found"
+            self.log.info(msg)
             raise IOError(errno.ENXIO, msg)
-            
-        values = []
         dt = dset.dtype
         typeItem = getTypeItem(dt)
-        itemSize = getItemSize(typeItem)
-        if typeItem['class'] != "H5T_COMPOUND":
-            msg = "Only compound type datasets can be used as query target"
+        if getItemSize(typeItem) == "H5T_VARIABLE" or dt.hasobject or \
+                (dt.kind == 'S' and six.PY3) or \
+                (dt.kind == 'V' and len(dt) <= 1 and len(dt.shape) == 0):
+            # same types as getDatasetValuesByUuid with binary format
+            msg = "Only JSON is supported for for this data type"
+            self.log.info(msg)
+            raise IOError(errno.EINVAL, msg)
+        if dset.shape is None:
+            msg = "Unable to stream values of null space dataset"
+            self.log.info(msg)
+            raise IOError(errno.EINVAL, msg)
+        if block_bytes <= 0:
+            msg = "block_bytes must be positive"
             self.log.info(msg)
             raise IOError(errno.EINVAL, msg)
+        selection = self._getSelectionSlices(dset, slices)
+        return self._streamDatasetBytes(dset, selection, block_bytes)
+
+    def _streamDatasetBytes(self, dset, selection, block_bytes):
+        dt = dset.dtype.newbyteorder('<')  # HDF5 will convert on read if needed
+        if len(dset.shape) == 0:
+            arr = np.empty((), dtype=dt)
+            dset.read_direct(arr)
+            yield memoryview(arr.reshape(-1).view(np.uint8))
+            return
+
+        rank = len(selection)
+        counts = [len(range(sel.start, sel.stop, sel.step)) for sel in selection]
+        if 0 in counts:
+            return
+        # block counts: trailing dims in full, innermost dim that doesn't fit is split
+        block = [1] * rank
+        elements = max(block_bytes // dt.itemsize, 1)
+        for dim in range(rank - 1, -1, -1):
+            if counts[dim] <= elements:
+                block[dim] = counts[dim]
+                elements //= counts[dim]
+            else:
+                block[dim] = elements
+                break
+        segments = []
+        for dim in range(rank):
+            segments.append(self._getStreamSegments(dset, dim, selection[dim], block[dim]))
+        for sel in itertools.product(*segments):
+            shape = tuple(len(range(x.start, x.stop, x.step)) for x in sel)
+            arr = np.empty(shape, dtype=dt)
+            dset.read_direct(arr, source_sel=sel)
+            yield memoryview(arr.reshape(-1).view(np.uint8))
+
+    """
+     _getStreamSegments: return the slices splitting the selection s of
+        dimension dim into pieces of at most count elements.  Piece
+        boundaries are at multiples of the span in the dataset, which is a
+        multiple of the chunk extent if a chunk fits in count elements.
+    """
+    def _getStreamSegments(self, dset, dim, s, count):
+        if count >= len(range(s.start, s.stop, s.step)):
+            return [s]
+        span = count * s.step
+        if dset.chunks and dset.chunks[dim] <= span:
+            span = (span // dset.chunks[dim]) * dset.chunks[dim]
+        segments = []
+        start = s.start
+        while start < s.stop:
+            stop = min(((start // span) + 1) * span, s.stop)
+            segments.append(slice(start, stop, s.step))
+            start += len(range(start, stop, s.step)) * s.step
+        return segments
+
+    """
+     _getSelectionSlices: return a tuple with a slice with explicit
+        start, stop, and step for each dimension of the dataset
+    """
+    def _getSelectionSlices(self, dset, slices):
+        rank = len(dset.shape)
+        if slices is Ellipsis or slices is None:
+            slices = ()
+        elif type(slices) not in (list, tuple):
+            slices = (slices,)
+        if len(slices) > rank:
+            msg = "number of dims in selection not same as rank"
+            self.log.info(msg)
+            raise IOError(errno.EINVAL, msg)
+        selection = []
+        for dim in range(rank):
+            extent = dset.shape[dim]
+            s = slice(0, extent, 1)
+            if dim < len(slices) and slices[dim] is not Ellipsis:
+                s = slices[dim]
+                if type(s) is not slice:
+                    s = slice(s, s + 1, 1)  # integer index
+                (start, stop, step) = s.indices(extent)
+                if step <= 0 or start < 0:
+                    msg = "invalid slice specification"
+                    self.log.info(msg)
+                    raise IOError(errno.EINVAL, msg)
+                s = slice(start, max(start, stop), step)
+            selection.append(s)
+        return tuple(selection)
+
+    """
+     _getSelectionShape: return shape of the array selected by slices
+    """
+    def _getSelectionShape(self, dset, slices, dims=None):
+        if dims is None:
+            dims = dset.shape
+        if slices is Ellipsis:
+            return dims
+        if type(slices) is not tuple:
+            slices = (slices,)
+        shape = []
+        for dim in range(len(dims)):
+            if dim >= len(slices):
+                shape.append(dims[dim])
+                continue
+            s = slices[dim]
+            if type(s) is slice:
+                shape.append(len(range(*s.indices(dims[dim]))))
+            elif s is Ellipsis:
+                shape.append(dims[dim])
+            # integer index drops the dimension
+        return tuple(shape)
+
+    """
+    getDatasetMemmapByUuid - return a read-only numpy.memmap of the values of
+      the dataset identified by obj_uuid (optionally sliced).
+      Only contiguous, unfiltered datasets with fixed size types can be
+      mapped; returns None for other datasets.
+    """
+    def getDatasetMemmapByUuid(self, obj_uuid, slices=Ellipsis):
+        dset = self.getDatasetObjByUuid(obj_uuid)
+        self._syncExtent(obj_uuid, slices)
+        if dset is None:
+            msg = "Dataset: " + obj_uuid + " not found"
+            self.log.info(msg)
+            raise IOError(errno.ENXIO, msg)
+        return self._getDatasetMemmap(dset, slices)
+
+    def _getMemmapRead(self, dset, slices):
+        # memory map for a value read, or None to read through HDF5
+        if not self.memmap_reads:
+            return None
+        return self._getDatasetMemmap(dset, slices, _MEMMAP_MIN_BYTES)
+
+    """
+     _getDatasetMemmap: return memmap over the dataset storage, or None
+        if the data isn't stored as one byte range in the file, or the
+        selection is less than min_bytes.
+    """
+    def _getDatasetMemmap(self, dset, slices=Ellipsis, min_bytes=0):
+        shape = dset.shape
+        if shape is None or len(shape) == 0:
+            return None
+        nbytes = dset.dtype.itemsize
+        for extent in shape:
+            nbytes *= extent
+        if nbytes == 0 or nbytes < min_bytes:
+            return None
+        if min_bytes and slices is not Ellipsis:
+            selection_bytes = dset.dtype.itemsize
+            for extent in self._getSelectionShape(dset, slices, dims=shape):
+                selection_bytes *= extent
+            if selection_bytes < min_bytes:
+                return None
+        if dset.dtype.hasobject or self.f.driver not in ('sec2', 'stdio'):
+            return None
+        if not hasattr(dset.id, 'get_offset'):
+            return None  # requires h5py 2.3 or later
+        plist = dset.id.get_create_plist()
+        if plist.get_layout() != h5py.h5d.CONTIGUOUS:
+            return None
+        if plist.get_nfilters() or plist.get_external_count():
+            return None
+        offset = dset.id.get_offset()
+        if offset is None or dset.id.get_storage_size() != nbytes:
+            return None  # storage not allocated
+        if self._memmap_flush:
+            self.f.flush()  # make sure values we've written are on disk
+            self._memmap_flush = False
+        mm = np.memmap(self.f.filename, dtype=dset.dtype, mode='r',
+                       offset=offset, shape=shape)
+        if slices is Ellipsis:
+            return mm
+        if type(slices) is list:
+            slices = tuple(slices)
+        return mm[slices]
+
+    """
+      doDatasetQueryByUuid: return rows based on query string
+        Return rows from a dataset that matches query string.
+
+        For compound type datasets (which must be one-dimensional), returns
+        the matching row indexes and row values.
+
+        For integer and float datasets of any rank, the query refers to the
+        element value as "value" (e.g. "value > 0.5"), and the coordinates
+        (a list per element for rank > 1) and values of matching elements
+        are returned.  start and stop select along the first dimension.
+    """
+    def doDatasetQueryByUuid(self, obj_uuid, query, start=0, stop=-1, step=1, limit=None):
+        self.log.info("doQueryByUuid - uuid: " + obj_uuid + " query:" + query)
+        self.log.info("start: " + str(start) + " stop: " + str(stop) + " step: " + str(step) + " limit: " + str(limit))
+        dset = self.getDatasetObjByUuid(obj_uuid)   
+        self._syncExtent(obj_uuid)
+        if dset is None:
+            msg = "Dataset: " + obj_uuid + " not found"
+            self.log.info(msg)
+            raise IOError(errno.ENXIO, msg)
             
         if dset.shape is None:
             # null space dataset (with h5py 2.6.0)
             return None   
-               
+
+        field_names = self._getQueryFieldNames(dset)
+        is_compound = dset.dtype.names is not None
         rank = len(dset.shape)
-        if rank != 1:
-            msg = "One one-dimensional datasets can be used as query target"
-            self.log.info(msg)
-            raise IOError(errno.EINVAL, msg)
-        
 
         values = []
         indexes = []
@@ -2231,20 +3608,30 @@ class Hdf5db:
             stop = num_elements
         elif stop > num_elements:
             stop = num_elements
-        block_size = self._getBlockSize(dset)
-        self.log.info("block_size: " + str(block_size))   
-        
-        field_names = list(dset.dtype.fields.keys())
+        self.log.info("block shape: " + str(self._getBlockShape(dset)))
+
         eval_str = self._getEvalStr(query, field_names) 
         
-        while start < stop:
+        for slices in self._getQueryBlocks(dset, start, stop):
             if limit and (count == limit):
                 break  # no more rows for this batch
-            end = start  + block_size
-            if end > stop:
-                end = stop
-            rows = dset[start:end]  # read from dataset
+            start = slices[0].start
+            rows = self._getQueryRows(dset, slices)  # read from dataset
             where_result = np.where(eval(eval_str))
+            if not is_compound:
+                index = where_result[0]
+                if limit:
+                    index = index[:(limit - count)]
+                values.extend(rows['value'][index].tolist())
+                if rank == 1:
+                    indexes.extend((index + start).tolist())
+                else:
+                    block_shape = tuple(s.stop - s.start for s in slices)
+                    coords = np.array(np.unravel_index(index, block_shape)).T
+                    coords += [s.start for s in slices]
+                    indexes.extend(coords.tolist())
+                count += len(index)
+                continue
             index = where_result[0].tolist()
             if len(index) > 0:
                 for i in index:
@@ -2255,32 +3642,261 @@ class Hdf5db:
                     count += 1
                     if limit and (count == limit):
                         break  # no more rows for this batch
-                              
-            start = end  # go to next block
             
          
         # values = self.getDataValue(item_type, values, dimension=1, dims=(len(values),))
         
         self.log.info("got " + str(count) + " query matches")    
         return (indexes, values)
-    
+
     """
-     _getBlockSize: Get number of rows to read from disk
-     
-        heurestic to get reasonable sized chunk of data to fetch.
-        make multiple of chunk_size if possible
-    """    
-    def _getBlockSize(self, dset):
-        target_block_size = 256 * 1000
-        if dset.chunks:
-            chunk_size = dset.chunks[0]
-            if chunk_size < target_block_size:
-                block_size = (target_block_size // chunk_size) * chunk_size
+      doDatasetAggregateByUuid: return aggregate values for rows matching query
+        Aggregates are given as a list of strings of the form: "count",
+        "sum(<field>)", "mean(<field>)", "min(<field>)", or "max(<field>)".
+        Rows are read and reduced block by block, so only the aggregate values
+        are returned.
+
+        If group_by is None, returns a dict of aggregate -> value.  Otherwise
+        returns a list (ordered by group value) with one dict per distinct
+        value of the group_by field.
+
+        Targets are the same as for doDatasetQueryByUuid.
+    """
+    def doDatasetAggregateByUuid(self, obj_uuid, aggregates, query=None, group_by=None,
+                                 start=0, stop=-1, max_groups=1000):
+        self.log.info("doDatasetAggregateByUuid - uuid: " + obj_uuid + " aggregates: " + str(aggregates))
+        self.log.info("query: " + str(query) + " group_by: " + str(group_by))
+        dset = self.getDatasetObjByUuid(obj_uuid)
+        self._syncExtent(obj_uuid)
+        if dset is None:
+            msg = "Dataset: " + obj_uuid + " not found"
+            self.log.info(msg)
+            raise IOError(errno.ENXIO, msg)
+
+        if dset.shape is None:
+            # null space dataset (with h5py 2.6.0)
+            return None
+
+        field_names = self._getQueryFieldNames(dset)
+        ops = self._getAggregateOps(aggregates, self._getQueryDtype(dset))
+        if group_by is not None and group_by not in field_names:
+            msg = "unknown group_by field name"
+            self.log.info("EINVAL: " + msg)
+            raise IOError(errno.EINVAL, msg)
+        eval_str = None
+        if query:
+            eval_str = self._getEvalStr(query, field_names)
+
+        num_elements = dset.shape[0]
+        if stop == -1 or stop > num_elements:
+            stop = num_elements
+        self.log.info("block shape: " + str(self._getBlockShape(dset)))
+
+        acc = {}     # accumulators for ungrouped aggregates
+        groups = {}  # group value -> accumulators
+        for slices in self._getQueryBlocks(dset, start, stop):
+            rows = self._getQueryRows(dset, slices)  # read from dataset
+            if eval_str:
+                rows = rows[eval(eval_str)]
+            if group_by is None:
+                self._updateAggregates(acc, ops, rows)
+            elif len(rows) > 0:
+                keys, inverse = np.unique(rows[group_by], return_inverse=True)
+                for i in range(len(keys)):
+                    key = keys[i].item()
+                    if key not in groups:
+                        if len(groups) == max_groups:
+                            msg = "number of groups exceeds limit of: " + str(max_groups)
+                            self.log.info("EINVAL: " + msg)
+                            raise IOError(errno.EINVAL, msg)
+                        groups[key] = {}
+                    self._updateAggregates(groups[key], ops, rows[inverse == i])
+
+        if group_by is None:
+            return self._getAggregateValues(acc, ops)
+
+        items = []
+        for key in sorted(groups.keys()):
+            item = self._getAggregateValues(groups[key], ops)
+            item[group_by] = self.bytesArrayToList(key)
+            items.append(item)
+        self.log.info("got " + str(len(items)) + " aggregate groups")
+        return items
+
+    """
+     _getAggregateOps: Get list of (name, op, field) tuples for the given aggregates
+    """
+    def _getAggregateOps(self, aggregates, dt):
+        if type(aggregates) in (str, unicode):
+            aggregates = (aggregates,)
+        if not aggregates:
+            msg = "No aggregate value"
+            self.log.info("EINVAL: " + msg)
+            raise IOError(errno.EINVAL, msg)
+        ops = []
+        for aggregate in aggregates:
+            aggregate = aggregate.strip()
+            if aggregate == "count":
+                ops.append((aggregate, "count", None))
+                continue
+            n = aggregate.find('(')
+            op = aggregate[:n].strip()
+            field = aggregate[n+1:-1].strip()
+            if n < 0 or not aggregate.endswith(')') or op not in ("sum", "mean", "min", "max"):
+                msg = "invalid aggregate: [" + aggregate + "]"
+                self.log.info("EINVAL: " + msg)
+                raise IOError(errno.EINVAL, msg)
+            if field not in dt.fields:
+                msg = "unknown field name"
+                self.log.info("EINVAL: " + msg)
+                raise IOError(errno.EINVAL, msg)
+            if dt.fields[field][0].kind not in ('i', 'u', 'f', 'b'):
+                msg = "aggregate field: [" + field + "] is not numeric"
+                self.log.info("EINVAL: " + msg)
+                raise IOError(errno.EINVAL, msg)
+            ops.append((aggregate, op, field))
+        return ops
+
+    """
+     _updateAggregates: reduce the given rows into the accumulator dict
+    """
+    def _updateAggregates(self, acc, ops, rows):
+        nrows = len(rows)
+        if nrows == 0:
+            return
+        for (name, op, field) in ops:
+            if op == "count":
+                acc[name] = acc.get(name, 0) + nrows
+                continue
+            col = rows[field]
+            if op == "sum":
+                acc[name] = acc.get(name, 0) + col.sum()
+            elif op == "mean":
+                (total, count) = acc.get(name, (0, 0))
+                acc[name] = (total + col.sum(dtype=np.float64), count + nrows)
+            elif op == "min":
+                value = col.min()
+                if name not in acc or value < acc[name]:
+                    acc[name] = value
+            else:  # max
+                value = col.max()
+                if name not in acc or value > acc[name]:
+                    acc[name] = value
+
+    """
+     _getAggregateValues: return json serializable aggregate values from accumulators
+    """
+    def _getAggregateValues(self, acc, ops):
+        item = {}
+        for (name, op, field) in ops:
+            if op in ("count", "sum"):
+                value = acc.get(name, 0)
+            elif op == "mean":
+                value = None
+                if name in acc:
+                    (total, count) = acc[name]
+                    value = total / count
             else:
-                block_size = target_block_size
-        else:
-            block_size = target_block_size
-        return block_size
+                value = acc.get(name)  # None if no rows were selected
+            if isinstance(value, (np.ndarray, np.generic)):
+                value = value.tolist()
+            item[name] = value
+        return item
+
+    """
+     _getQueryFieldNames: Get field names that can be used in a query of the dataset
+
+        Raises EINVAL if the dataset can't be used as a query target.
+    """
+    def _getQueryFieldNames(self, dset):
+        typeItem = getTypeItem(dset.dtype)
+        rank = len(dset.shape)
+        if typeItem['class'] == "H5T_COMPOUND":
+            if rank != 1:
+                msg = "One one-dimensional datasets can be used as query target"
+                self.log.info(msg)
+                raise IOError(errno.EINVAL, msg)
+            return list(dset.dtype.fields.keys())
+        if typeItem['class'] not in ("H5T_INTEGER", "H5T_FLOAT"):
+            msg = "Only compound, integer, or float type datasets can be used as query target"
+            self.log.info(msg)
+            raise IOError(errno.EINVAL, msg)
+        if rank == 0:
+            msg = "Scalar datasets can not be used as query target"
+            self.log.info(msg)
+            raise IOError(errno.EINVAL, msg)
+        return ["value", ]
+
+    """
+     _getQueryDtype: Get the dtype of rows returned by _getQueryRows
+    """
+    def _getQueryDtype(self, dset):
+        if dset.dtype.names is not None:
+            return dset.dtype
+        return np.dtype([('value', dset.dtype)])
+
+    """
+     _getQueryRows: read the block given by slices
+
+        For non-compound types, the elements are returned as a one-dimensional
+        array with a single 'value' field, so query and aggregate expressions
+        can be evaluated the same way for all datasets.
+    """
+    def _getQueryRows(self, dset, slices):
+        rows = dset[slices]
+        if dset.dtype.names is not None:
+            return rows
+        rows = np.ascontiguousarray(rows).reshape(-1)
+        return rows.view(self._getQueryDtype(dset))
+
+    """
+     _getBlockShape: Get dims of the blocks to read from disk
+
+        heurestic to get reasonable sized chunk of data to fetch, at most
+        _QUERY_BLOCK_BYTES.  Blocks take the full extent of the trailing
+        dimensions when a row fits, otherwise the innermost dimension that
+        doesn't fit is split (and the dimensions before it read one at a
+        time).  Block dims are made a multiple of the chunk dims if possible.
+    """
+    def _getBlockShape(self, dset):
+        rank = len(dset.shape)
+        elements = max(_QUERY_BLOCK_BYTES // max(dset.dtype.itemsize, 1), 1)
+        block = [1] * rank
+        for dim in range(rank - 1, 0, -1):
+            extent = max(dset.shape[dim], 1)
+            if extent <= elements:
+                block[dim] = extent
+                elements //= extent
+            else:
+                block[dim] = self._alignToChunk(dset, dim, elements)
+                elements = 1
+                break
+        block[0] = self._alignToChunk(dset, 0, elements)
+        return tuple(block)
+
+    def _alignToChunk(self, dset, dim, count):
+        # largest multiple of the chunk extent no more than count (if any)
+        if dset.chunks and dset.chunks[dim] <= count:
+            return (count // dset.chunks[dim]) * dset.chunks[dim]
+        return count
+
+    """
+     _getQueryBlocks: generate the selections (tuples of slices) for blocks
+        covering rows start to stop, in row-major order
+    """
+    def _getQueryBlocks(self, dset, start, stop):
+        block = self._getBlockShape(dset)
+        rank = len(dset.shape)
+        origins = [range(0, dset.shape[dim], block[dim]) for dim in range(1, rank)]
+        while start < stop:
+            end = min(start + block[0], stop)
+            for origin in itertools.product(*origins):
+                slices = [slice(start, end)]
+                for dim in range(1, rank):
+                    offset = origin[dim - 1]
+                    slices.append(slice(offset, min(offset + block[dim], dset.shape[dim])))
+                yield tuple(slices)
+            start = end
     
     """
      _getEvalStr: Get eval string for given query
@@ -2362,48 +3978,230 @@ class Hdf5db:
             
         return eval_str
 
+    """
+     _getSelectionSpaces: generate (index, file space, memory space) for each
+        of the normalized selections that selects any elements.  The file
+        space is shared, with the hyperslab of the current selection
+        selected; the memory space has the shape of the selection.
+    """
+    def _getSelectionSpaces(self, dset, selections):
+        fspace = dset.id.get_space()
+        for i in range(len(selections)):
+            start = tuple(s.start for s in selections[i])
+            count = tuple(len(range(s.start, s.stop, s.step)) for s in selections[i])
+            if 0 in count:
+                continue
+            stride = tuple(s.step for s in selections[i])
+            fspace.select_hyperslab(start, count, stride, op=h5py.h5s.SELECT_SET)
+            yield (i, fspace, h5py.h5s.create_simple(count))
+
+    """
+     _normalizeSelections: return list of normalized selections (explicit
+        slices for each dimension) for the list of slice tuples
+    """
+    def _normalizeSelections(self, dset, selections, caller):
+        if type(selections) not in (list, tuple) or len(selections) == 0:
+            msg = caller + ": selections must be a non-empty list"
+            self.log.info(msg)
+            raise IOError(errno.EINVAL, msg)
+        normalized = []
+        for slices in selections:
+            if slices is not Ellipsis and (type(slices) not in (list, tuple) or len(slices) != len(dset.shape)):
+                msg = caller + ": number of dims in selection not same as rank"
+                self.log.info(msg)
+                raise IOError(errno.EINVAL, msg)
+            try:
+                normalized.append(self._getSelectionSlices(dset, slices))
+            except TypeError as e:
+                msg = caller + ": invalid selection: " + str(e)
+                self.log.info(msg)
+                raise IOError(errno.EINVAL, msg)
+        return normalized
+
+    """
+    getDatasetValuesBySelections - get values for each of a list of
+      selections (slice tuples) of the dataset identified by obj_uuid.
+      Each selection is read directly into its own array with a hyperslab
+      selection, without going through h5py.  Returns a list with the
+      values of each selection, as from getDatasetValuesByUuid.
+    """
+    def getDatasetValuesBySelections(self, obj_uuid, selections, format="json"):
+        dset = self.getDatasetObjByUuid(obj_uuid)
+        if format not in ("json", "binary"):
+            msg = "only json and binary formats are supported"
+            self.log.info(msg)
+            raise IOError(errno.EINVAL, msg)
+        if dset is None:
+            msg = "Dataset: " + obj_uuid + " not found"
+            self.log.info(msg)
+            raise IOError(errno.ENXIO, msg)
+        if dset.shape is None or len(dset.shape) == 0:
+            msg = "getDatasetValuesBySelections: dataset has no dimensions"
+            self.log.info(msg)
+            raise IOError(errno.EINVAL, msg)
+        if type(selections) in (list, tuple):
+            for slices in selections:
+                self._syncExtent(obj_uuid, slices)
+        normalized = self._normalizeSelections(dset, selections, "getDatasetValuesBySelections")
+        selections = [tuple(slices) if type(slices) is list else slices for slices in selections]
+
+        dt = dset.dtype
+        if dt.kind == 'O' or (dt.kind == 'V' and len(dt) <= 1 and len(dt.shape) == 0):
+            # vlen, reference and opaque types - read each selection
+            values = []
+            for slices in selections:
+                values.append(self.getDatasetValuesByUuid(obj_uuid, slices, format=format))
+            return values
+        if dt.kind == 'S' and six.PY3 and format != "json":
+            msg = "Only JSON is supported for for this data type"
+            self.log.info(msg)
+            raise IOError(errno.EINVAL, msg)
+
+        arrays = [None] * len(normalized)
+        mtype = h5py.h5t.py_create(dt)
+        for (i, fspace, mspace) in self._getSelectionSpaces(dset, normalized):
+            arrays[i] = np.empty(mspace.shape, dtype=dt)
+            dset.id.read(mspace, fspace, arrays[i], mtype=mtype)
+
+        values = []
+        for i in range(len(normalized)):
+            shape = self._getSelectionShape(dset, selections[i])
+            if arrays[i] is None:
+                arr = np.empty(shape, dtype=dt)
+            else:
+                arr = arrays[i].reshape(shape + dt.shape)
+            if format == "binary":
+                values.append(arr.tobytes())
+            elif dt.kind == 'S' and six.PY3 or len(dt) > 1:
+                values.append(self.bytesArrayToList(arr))
+            else:
+                values.append(arr.tolist())
+        return values
+
     """
     Get values from dataset identified by obj_uuid using the given
     point selection.
+    All points are read with one HDF5 point selection.
     """
     def getDatasetPointSelectionByUuid(self, obj_uuid, points):
         dset = self.getDatasetObjByUuid(obj_uuid)
+        self._syncExtent(obj_uuid)
         if dset is None:
             msg = "Dataset: " + obj_uuid + " not found"
             self.log.info(msg)
             raise IOError(errno.ENXIO, msg)
             
+        coords = self._getPointCoordinates(dset, points, "getDatasetPointSelection")
+        values = np.zeros(len(coords), dtype=dset.dtype)
+        if len(coords) > 0:
+            fspace = dset.id.get_space()
+            fspace.select_elements(coords)
+            mspace = h5py.h5s.create_simple((len(coords),))
+            # memory type is needed for array types (values has the array
+            # dims as extra dimensions)
+            dset.id.read(mspace, fspace, values, mtype=h5py.h5t.py_create(dset.dtype))
+        return values.tolist()
+
+    """
+     _getPointCoordinates: return point selection as a numpy array
+        of shape (npoints, rank) suitable for H5Sselect_elements
+    """
+    def _getPointCoordinates(self, dset, points, caller):
         rank = len(dset.shape)
-        values = np.zeros(len(points), dtype=dset.dtype)
         try:
-            i = 0
-            for point in points:
-                if rank == 1:
-                    values[i] = dset[[point]]
-                else:
-                    values[i] = dset[tuple(point)]
-                i += 1
-        except ValueError:
+            coords = np.array(points, dtype=np.int64)
+        except (TypeError, ValueError):
+            msg = caller + ", invalid point selection"
+            self.log.info(msg)
+            raise IOError(errno.EINVAL, msg)
+        if coords.size == 0:
+            return coords.reshape((0, rank))
+        if rank == 1 and coords.ndim == 1:
+            coords = coords.reshape((-1, 1))
+        if coords.ndim != 2 or coords.shape[1] != rank:
+            msg = caller + ", point selection number of elements must match rank of dataset"
+            self.log.info(msg)
+            raise IOError(errno.EINVAL, msg)
+        if np.any(coords < 0) or np.any(coords >= np.array(dset.shape, dtype=np.int64)):
             # out of range error
-            msg = "getDatasetPointSelection, out of range error"
+            msg = caller + ", out of range error"
             self.log.info(msg)
             raise IOError(errno.EINVAL, msg)
-        return values.tolist()
+        return coords.astype(np.uint64)
+
+    """
+     _isBinaryData: return True if data is a numpy array or supports the
+        buffer protocol (bytes, bytearray, memoryview, ...)
+    """
+    def _isBinaryData(self, data):
+        if isinstance(data, np.ndarray):
+            return True
+        if isinstance(data, six.text_type):
+            return False
+        try:
+            memoryview(data)
+        except TypeError:
+            return False
+        return True
+
+    """
+     _getValuesArray: return array of dataset values from a numpy array or
+        the bytes of a buffer.  The array shares memory with data if it
+        is already of the dataset type, so nothing is copied.  Array types
+        are returned as an array of the base type with the extra dimensions.
+    """
+    def _getValuesArray(self, dset, data, count=None):
+        dt = dset.dtype
+        if isinstance(data, np.ndarray):
+            if dt.hasobject != data.dtype.hasobject:
+                msg = "numpy array type doesn't match dataset type"
+                self.log.info(msg)
+                raise IOError(errno.EINVAL, msg)
+            try:
+                arr = np.asarray(data, dtype=dt.base)
+            except (TypeError, ValueError) as e:
+                msg = "unable to convert numpy array to dataset type: " + str(e)
+                self.log.info(msg)
+                raise IOError(errno.EINVAL, msg)
+            nbytes = arr.size * dt.base.itemsize
+        else:
+            view = memoryview(data)
+            nbytes = view.nbytes
+            if count is None and nbytes % dt.itemsize != 0:
+                msg = "data length is not a multiple of the type size"
+                self.log.info(msg)
+                raise IOError(errno.EINVAL, msg)
+            arr = None
+        if count is not None and count * dt.itemsize != nbytes:
+            msg = "Expected: " + str(count * dt.itemsize) + " bytes, but got: " + str(nbytes)
+            self.log.info(msg)
+            raise IOError(errno.EINVAL, msg)
+        if arr is None:
+            try:
+                arr = np.frombuffer(view, dtype=dt)  # no copy
+            except (TypeError, ValueError, BufferError) as e:
+                msg = "data must be a contiguous buffer: " + str(e)
+                self.log.info(msg)
+                raise IOError(errno.EINVAL, msg)
+        return arr
 
     """
     setDatasetValuesByUuid - update the given dataset values with supplied data
       and optionally a hyperslab selection (slices)
     """
     def setDatasetValuesByUuid(self, obj_uuid, data, slices=None, format="json"):
-        dset = self.getDatasetObjByUuid(obj_uuid)
+        self.initFile()
+        dset = self._getDatasetObj(obj_uuid)
+        if dset is not None:
+            self._syncExtent(obj_uuid, Ellipsis if slices is None else slices)
         
         if format not in ("json", "binary"):
             msg = "only json and binary formats are supported"
             self.log.info(msg)
             raise IOError(errno.EINVAL, msg)
             
-        if format == "binary" and type(data) is not bytes:
-            msg ="data must be of type bytes for binary writing"
+        if format == "binary" and not self._isBinaryData(data):
+            msg ="data must be a bytes-like object or numpy array for binary writing"
             self.log.info(msg)
             raise IOError(errno.EINVAL, msg)
             
@@ -2458,9 +4256,8 @@ class Hdf5db:
                 msg = "invalid slice specification"
                 self.log.info(msg)
                 raise IOError(errno.EINVAL, msg)
-            np_shape.append(s.stop - s.start)
-                        
-            count = (s.stop - s.start) // s.step
+            count = len(range(s.start, s.stop, s.step))
+            np_shape.append(count)
             if count <= 0:
                 msg = "invalid slice specification"
                 self.log.info(msg)
@@ -2481,7 +4278,7 @@ class Hdf5db:
             #for i in range(len(data)):
             #    converted_data.append(self.toTuple(data[i]))
             #data = converted_data
-        else:
+        elif not isinstance(data, np.ndarray):
             h5t_check = h5py.check_dtype(ref=dset.dtype)
             if h5t_check in (h5py.Reference, h5py.RegionReference):
                 # convert data to data refs
@@ -2491,22 +4288,10 @@ class Hdf5db:
                     raise IOError(errno.EINVAL, msg)  
                 data = self.listToRef(data)
                     
-        if format == "binary":
-            if npoints*itemSize != len(data):
-                msg = "Expected: " + str(npoints*itemSize) + " bytes, but got: " + str(len(data))
-                self.log.info(msg)
-                raise IOError(errno.EINVAL, msg)
-            if dset.dtype.shape == ():
-                arr = np.fromstring(data, dtype=dset.dtype)
-                arr = arr.reshape(np_shape)  # conform to selection shape
-            else:
-                # tricy array type!
-                arr = np.empty(np_shape, dtype=dset.dtype)
-                base_arr = np.fromstring(data, dtype=dset.dtype.base)
-                base_shape = list(np_shape)
-                base_shape.extend(dset.dtype.shape)  # add on the type dimensions
-                base_arr = base_arr.reshape(base_shape)
-                arr[...] = base_arr
+        if format == "binary" or isinstance(data, np.ndarray):
+            arr = self._getValuesArray(dset, data, npoints)
+            # conform to selection shape (plus the dimensions of array types)
+            arr = arr.reshape(np_shape + dset.dtype.shape)
         else:
             # data is json
             if npoints == 1 and len(dset.dtype) > 1:
@@ -2540,8 +4325,30 @@ class Hdf5db:
                 self.log.info(msg)
                 raise IOError(errno.EINVAL, msg)
                     
+        if obj_uuid in self._getAutoFilterDatasets():
+            dset = self._resolveAutoFilters(obj_uuid, dset, arr)
+
+        if obj_uuid in self._write_buffers:
+            if self._bufferWrite(obj_uuid, slices, arr, np_shape + dset.dtype.shape):
+                self._invalidateValueCache(obj_uuid)
+                return True  # modified time is set when the buffer is written
+            self._flushWriteBuffer(obj_uuid)
+
         # write temp numpy array to dataset        
-        if rank == 1:
+        self._writeDatasetValues(dset, slices, arr)
+
+        self._invalidateValueCache(obj_uuid)
+
+        # update modified time
+        self.setModifiedTime(obj_uuid)
+        return True
+
+    def _writeDatasetValues(self, dset, slices, arr):
+        if self._writeParallel(dset, slices, arr):
+            pass  # written as pre-compressed chunks
+        elif self._writeSparse(dset, slices, arr):
+            pass  # fill value chunks skipped
+        elif len(slices) == 1:
             s = slices[0]
             try:
                 dset[s] = arr
@@ -2555,6 +4362,359 @@ class Hdf5db:
                 self.log.info("h5py setitem exception: " + str(te))
                 raise IOError(errno.EINVAL, str(te))
 
+    """
+      setDatasetWriteBuffer - buffer writes to the dataset made with
+        setDatasetValuesByUuid.  Adjacent and overlapping writes are merged
+        in memory and written when more than nbytes are buffered, on the
+        first call to any method after the oldest write is more than max_age
+        seconds old, when the dataset is accessed by any other method, or on
+        flush or close.  Buffered values are written with chunk-aligned
+        selections.  Strided writes write the buffer first and are then made
+        directly.
+        Use nbytes of 0 to write any buffered values and stop buffering.
+    """
+    def setDatasetWriteBuffer(self, obj_uuid, nbytes, max_age=_WRITE_BUFFER_MAX_AGE):
+        self.initFile()
+        if self.readonly:
+            msg = "Unable to buffer writes (Updates are not allowed)"
+            self.log.info(msg)
+            raise IOError(errno.EPERM, msg)
+        dset = self.getDatasetObjByUuid(obj_uuid)  # writes anything buffered
+        if dset is None:
+            msg = "Dataset: " + obj_uuid + " not found"
+            self.log.info(msg)
+            raise IOError(errno.ENXIO, msg)
+        if nbytes < 0 or max_age < 0:
+            msg = "invalid write buffer settings"
+            self.log.info(msg)
+            raise IOError(errno.EINVAL, msg)
+        if nbytes == 0:
+            self._write_buffers.pop(obj_uuid, None)
+        else:
+            self._write_buffers[obj_uuid] = {'nbytes': nbytes, 'max_age': max_age,
+                                             'blocks': [], 'size': 0, 'time': None}
+
+    """
+     _bufferWrite: add the values for the (unit-stride) selection to the
+        dataset's write buffer, merging with any buffered block it overlaps
+        or adjoins where that keeps the order of overlapping writes.
+        Returns False if the write can't be buffered.
+    """
+    def _bufferWrite(self, obj_uuid, slices, arr, np_shape):
+        write_buffer = self._write_buffers[obj_uuid]
+        start = []
+        for s in slices:
+            if type(s) is not slice or s.step not in (None, 1):
+                return False
+            start.append(s.start)
+        if arr.shape != np_shape:
+            if arr.size == np.prod(np_shape):
+                arr = arr.reshape(np_shape)
+            elif arr.size == 1:
+                arr = np.broadcast_to(arr.reshape(()), np_shape)
+            else:
+                msg = "data shape doesn't match selection shape"
+                msg += "--data shape: " + str(arr.shape)
+                msg += "--selection shape: " + str(np_shape)
+                self.log.info(msg)
+                raise IOError(errno.EINVAL, msg)
+        blocks = write_buffer['blocks']
+        blocks.append((tuple(start), np.array(arr)))  # copy, the caller may reuse data
+        write_buffer['size'] += arr.nbytes
+
+        # blocks are written in list order, so two blocks are only merged
+        # (at the position of the earlier one) if no block between them
+        # overlaps the later one
+        pos = len(blocks) - 1
+        merged = True
+        while merged:
+            merged = False
+            for i in range(len(blocks)):
+                if i == pos:
+                    continue
+                (first, last) = (min(i, pos), max(i, pos))
+                if any(self._blocksOverlap(blocks[j], blocks[last])
+                       for j in range(first + 1, last)):
+                    continue
+                union = self._mergeBlocks(blocks[first], blocks[last])
+                if union is not None:
+                    write_buffer['size'] -= blocks[first][1].nbytes + blocks[last][1].nbytes
+                    del blocks[last]
+                    blocks[first] = union
+                    write_buffer['size'] += union[1].nbytes
+                    pos = first
+                    merged = True
+                    break
+        if write_buffer['time'] is None:
+            write_buffer['time'] = time.time()
+        if write_buffer['size'] > write_buffer['nbytes']:
+            self._flushWriteBuffer(obj_uuid)
+        return True
+
+    """
+     _mergeBlocks: return the block (start, arr) covering both blocks if
+        their union is a hyperslab, otherwise None.  Values of the second
+        block take precedence.
+    """
+    def _mergeBlocks(self, block, new_block):
+        (start, arr) = block
+        (new_start, new_arr) = new_block
+        rank = len(start)
+        union_start = []
+        union_stop = []
+        differ = 0
+        for dim in range(rank):
+            stop = start[dim] + arr.shape[dim]
+            new_stop = new_start[dim] + new_arr.shape[dim]
+            if new_start[dim] > stop or start[dim] > new_stop:
+                return None  # gap between blocks
+            union_start.append(min(start[dim], new_start[dim]))
+            union_stop.append(max(stop, new_stop))
+            if start[dim] != new_start[dim] or stop != new_stop:
+                differ += 1
+
+        if differ > 1:
+            # union is only a hyperslab if one block contains the other
+            contains_new = True
+            contained = True
+            for dim in range(rank):
+                stop = start[dim] + arr.shape[dim]
+                new_stop = new_start[dim] + new_arr.shape[dim]
+                if new_start[dim] < start[dim] or new_stop > stop:
+                    contains_new = False
+                if start[dim] < new_start[dim] or stop > new_stop:
+                    contained = False
+            if contained:
+                return new_block
+            if not contains_new:
+                return None
+
+        shape = tuple(union_stop[dim] - union_start[dim] for dim in range(rank))
+        if shape == arr.shape[:rank]:
+            union_arr = arr  # already a private copy
+        else:
+            # trailing dimensions of array types are kept
+            union_arr = np.empty(shape + arr.shape[rank:], dtype=arr.dtype)
+            union_arr[tuple(slice(start[dim] - union_start[dim],
+                                  start[dim] - union_start[dim] + arr.shape[dim])
+                            for dim in range(rank))] = arr
+        union_arr[tuple(slice(new_start[dim] - union_start[dim],
+                              new_start[dim] - union_start[dim] + new_arr.shape[dim])
+                        for dim in range(rank))] = new_arr
+        return (tuple(union_start), union_arr)
+
+    def _blocksOverlap(self, block, other):
+        # True if the two buffered blocks share any element
+        (start, arr) = block
+        (other_start, other_arr) = other
+        return all(start[dim] < other_start[dim] + other_arr.shape[dim] and
+                   other_start[dim] < start[dim] + arr.shape[dim]
+                   for dim in range(len(start)))
+
+    """
+     _flushWriteBuffer: write the buffered blocks for the dataset.  Blocks
+        are widened to chunk boundaries and blocks that then share a chunk
+        are combined, so each chunk is written once with a whole-chunk
+        selection.  Values of the widened region not in any block are read
+        from the dataset first.
+    """
+    def _flushWriteBuffer(self, obj_uuid):
+        write_buffer = self._write_buffers.get(obj_uuid)
+        if write_buffer is None or not write_buffer['blocks']:
+            return
+        blocks = write_buffer['blocks']
+        write_buffer['blocks'] = []
+        write_buffer['size'] = 0
+        write_buffer['time'] = None
+        dset = self._getDatasetObj(obj_uuid)
+        if dset is None:
+            return  # dataset has been deleted
+        self.log.info("writing " + str(len(blocks)) + " buffered blocks for dataset: " + obj_uuid)
+        regions = self._getAlignedRegions(dset, blocks)
+        regions.sort(key=lambda region: region[0])  # write in storage order
+        for (start, stop, members) in regions:
+            rank = len(start)
+            shape = tuple(stop[dim] - start[dim] for dim in range(rank))
+            slices = tuple(slice(start[dim], stop[dim], 1) for dim in range(rank))
+            (block_start, block_arr) = blocks[members[0]]
+            if len(members) == 1 and block_arr.shape[:rank] == shape:
+                self._writeDatasetValues(dset, slices, block_arr)
+                continue
+            arr = np.empty(shape + block_arr.shape[rank:], dtype=block_arr.dtype)
+            covered = np.zeros(shape, dtype=bool)
+            for i in members:
+                (block_start, block_arr) = blocks[i]
+                covered[self._getBlockSlices(block_start, block_arr, start)] = True
+            if not covered.all():
+                arr[...] = dset[slices]
+            for i in members:  # in order written, so later values take precedence
+                (block_start, block_arr) = blocks[i]
+                arr[self._getBlockSlices(block_start, block_arr, start)] = block_arr
+            self._writeDatasetValues(dset, slices, arr)
+        self._invalidateValueCache(obj_uuid)
+
+        # update modified time
+        self.setModifiedTime(obj_uuid)
+
+    """
+     _getAlignedRegions: return list of (start, stop, members) for the
+        blocks widened to chunk boundaries (clipped to the dataset extent),
+        where members are the indexes of the blocks in each region.  Blocks
+        whose widened selections overlap share a region covering both.
+    """
+    def _getAlignedRegions(self, dset, blocks):
+        regions = []
+        for i in range(len(blocks)):
+            (block_start, block_arr) = blocks[i]
+            start = []
+            stop = []
+            for dim in range(len(block_start)):
+                first = block_start[dim]
+                last = first + block_arr.shape[dim]
+                if dset.chunks:
+                    extent = dset.chunks[dim]
+                    first = (first // extent) * extent
+                    last = min(-(-last // extent) * extent, dset.shape[dim])
+                start.append(first)
+                stop.append(last)
+            region = (start, stop, [i])
+            merged = True
+            while merged:
+                merged = False
+                for j in range(len(regions)):
+                    other = regions[j]
+                    if all(region[0][dim] < other[1][dim] and other[0][dim] < region[1][dim]
+                           for dim in range(len(start))):
+                        del regions[j]
+                        region = ([min(region[0][dim], other[0][dim]) for dim in range(len(start))],
+                                  [max(region[1][dim], other[1][dim]) for dim in range(len(start))],
+                                  sorted(region[2] + other[2]))
+                        merged = True
+                        break
+            regions.append(region)
+        return [(tuple(start), tuple(stop), members) for (start, stop, members) in regions]
+
+    def _getBlockSlices(self, block_start, block_arr, origin):
+        # selection of the block within a region starting at origin
+        return tuple(slice(block_start[dim] - origin[dim],
+                           block_start[dim] - origin[dim] + block_arr.shape[dim])
+                     for dim in range(len(block_start)))
+
+    def _flushWriteBuffers(self, expired_only=False):
+        now = time.time()
+        for obj_uuid in list(self._write_buffers.keys()):
+            write_buffer = self._write_buffers[obj_uuid]
+            if write_buffer['time'] is None:
+                continue
+            if expired_only and now - write_buffer['time'] < write_buffer['max_age']:
+                continue
+            self._flushWriteBuffer(obj_uuid)
+
+    """
+    setDatasetValuesBySelections - update the dataset values for each of a
+      list of selections (slice tuples) with the corresponding item of data.
+      Each selection is written directly from its array with a hyperslab
+      selection, without going through h5py; where selections overlap,
+      later selections take precedence.
+    """
+    def setDatasetValuesBySelections(self, obj_uuid, selections, data, format="json"):
+        self.initFile()
+        if self.readonly:
+            msg = "Unable to write dataset (Updates are not allowed)"
+            self.log.info(msg)
+            raise IOError(errno.EPERM, msg)
+        dset = self.getDatasetObjByUuid(obj_uuid)
+        if format not in ("json", "binary"):
+            msg = "only json and binary formats are supported"
+            self.log.info(msg)
+            raise IOError(errno.EINVAL, msg)
+        if dset is None:
+            msg = "Dataset: " + obj_uuid + " not found"
+            self.log.info(msg)
+            raise IOError(errno.ENXIO, msg)
+        if dset.shape is None or len(dset.shape) == 0:
+            msg = "setDatasetValuesBySelections: dataset has no dimensions"
+            self.log.info(msg)
+            raise IOError(errno.EINVAL, msg)
+        if type(selections) in (list, tuple):
+            for slices in selections:
+                self._syncExtent(obj_uuid, slices)
+        normalized = self._normalizeSelections(dset, selections, "setDatasetValuesBySelections")
+        selections = [tuple(slices) if type(slices) is list else slices for slices in selections]
+        if type(data) not in (list, tuple) or len(data) != len(normalized):
+            msg = "setDatasetValuesBySelections: number of data items doesn't match number of selections"
+            self.log.info(msg)
+            raise IOError(errno.EINVAL, msg)
+        for slices in selections:
+            if slices is Ellipsis:
+                continue
+            for dim in range(len(slices)):
+                s = slices[dim]
+                if type(s) is slice and (s.stop is not None and s.stop > dset.shape[dim]):
+                    msg = "invalid slice specification"
+                    self.log.info(msg)
+                    raise IOError(errno.EINVAL, msg)
+                if type(s) is not slice and (s < 0 or s >= dset.shape[dim]):
+                    msg = "invalid slice specification"
+                    self.log.info(msg)
+                    raise IOError(errno.EINVAL, msg)
+
+        dt = dset.dtype
+        if dt.kind == 'O' or h5py.check_dtype(ref=dt) is not None:
+            # vlen and reference types - write each selection
+            for i in range(len(normalized)):
+                self.setDatasetValuesByUuid(obj_uuid, data[i], normalized[i], format=format)
+            return True
+        if format == "binary":
+            itemSize = getItemSize(getTypeItem(dt))
+            if itemSize == "H5T_VARIABLE":
+                msg = "Only JSON is supported for for this data type"
+                self.log.info(msg)
+                raise IOError(errno.EINVAL, msg)
+
+        arrays = []
+        for i in range(len(normalized)):
+            counts = tuple(len(range(s.start, s.stop, s.step)) for s in normalized[i])
+            npoints = int(np.prod(counts))
+            if npoints == 0:
+                msg = "invalid slice specification"
+                self.log.info(msg)
+                raise IOError(errno.EINVAL, msg)
+            item = data[i]
+            if format == "binary" or isinstance(item, np.ndarray):
+                if format == "binary" and not self._isBinaryData(item):
+                    msg = "data must be a bytes-like object or numpy array for binary writing"
+                    self.log.info(msg)
+                    raise IOError(errno.EINVAL, msg)
+                arr = self._getValuesArray(dset, item, npoints)
+            else:
+                if len(dt) > 1 and type(item) in (list, tuple):
+                    item = self.toTuple(len(self._getSelectionShape(dset, selections[i])), item)
+                try:
+                    arr = np.array(item, dtype=dt)
+                except (TypeError, ValueError) as e:
+                    msg = "unable to convert data: " + str(e)
+                    self.log.info(msg)
+                    raise IOError(errno.EINVAL, msg)
+                if arr.size != npoints * int(np.prod(dt.shape)):
+                    msg = "data shape doesn't match selection shape"
+                    msg += "--data shape: " + str(arr.shape)
+                    msg += "--selection shape: " + str(counts)
+                    self.log.info(msg)
+                    raise IOError(errno.EINVAL, msg)
+            arrays.append(np.ascontiguousarray(arr.reshape(counts + dt.shape)))
+
+        if obj_uuid in self._getAutoFilterDatasets():
+            sample = max(arrays, key=lambda arr: arr.size)
+            dset = self._resolveAutoFilters(obj_uuid, dset, sample)
+
+        # later selections overwrite earlier ones where they overlap
+        mtype = h5py.h5t.py_create(dt)
+        for (i, fspace, mspace) in self._getSelectionSpaces(dset, normalized):
+            dset.id.write(mspace, fspace, arrays[i], mtype=mtype)
+
+        self._invalidateValueCache(obj_uuid)
+
         # update modified time
         self.setModifiedTime(obj_uuid)
         return True
@@ -2565,14 +4725,15 @@ class Hdf5db:
     """
     def setDatasetValuesByPointSelection(self, obj_uuid, data, points, format="json"):
         dset = self.getDatasetObjByUuid(obj_uuid)
+        self._syncExtent(obj_uuid)
         
         if format not in ("json", "binary"):
             msg = "only json and binary formats are supported"
             self.log.info(msg)
             raise IOError(errno.EINVAL, msg)
             
-        if format == "binary" and type(data) is not bytes:
-            msg ="data must be of type bytes for binary writing"
+        if format == "binary" and not self._isBinaryData(data):
+            msg ="data must be a bytes-like object or numpy array for binary writing"
             self.log.info(msg)
             raise IOError(errno.EINVAL, msg)
             
@@ -2589,42 +4750,81 @@ class Hdf5db:
             self.log.info(msg)
             raise IOError(errno.EINVAL, msg)     
 
-        rank = len(dset.shape)
-
-        # need some special conversion for compound types --
-        # each element must be a tuple, but the JSON decoder
-        # gives us a list instead.
-        if format == "json" and len(dset.dtype) > 1 and type(data) in (list, tuple):
-            converted_data = self.toTuple(rank, data)
-            #for i in range(len(data)):
-            #    converted_data.append(self.toTuple(data[i]))
-            #data = converted_data
-        
-        if format == "json":
+        coords = self._getPointCoordinates(dset, points, "setDatasetValuesByPointSelection")
+        npoints = len(coords)
 
-            try:
-                i = 0
-                for point in points:
-                    if rank == 1:
-                        dset[[point]] = data[i]
-                    else:
-                        dset[tuple(point)] = data[i]
-                    i += 1
-            except ValueError:
-                # out of range error
-                msg = "setDatasetValuesByPointSelection, out of range error"
+        if format == "json" and not isinstance(data, np.ndarray):
+            # need some special conversion for compound types --
+            # each element must be a tuple, but the JSON decoder
+            # gives us a list instead.
+            if len(dset.dtype) > 1 and type(data) in (list, tuple):
+                data = self.toTuple(1, data)
+            elif h5py.check_dtype(ref=dset.dtype) in (h5py.Reference, h5py.RegionReference):
+                # convert data to data refs
+                data = self.listToRef(data)
+            if type(data) not in (list, tuple) or len(data) != npoints:
+                msg = "setDatasetValuesByPointSelection, number of values doesn't match number of points"
                 self.log.info(msg)
                 raise IOError(errno.EINVAL, msg)
-            
+            if dt.kind == 'O':
+                # vlen/reference values - fill element by element so numpy
+                # doesn't try to add a dimension for equal length sequences
+                arr = np.empty((npoints,), dtype=dt)
+                for i in range(npoints):
+                    arr[i] = data[i]
+            elif dt.subdtype is not None:
+                # array type - numpy would add the array dims to each element
+                arr = np.array(data, dtype=dt.base)
+            else:
+                arr = np.array(data, dtype=dt)
         else:
             #binary
-            arr = np.fromstring(data, dtype=dset.dtype)
-            dset[points] = arr     # coordinate write
+            arr = self._getValuesArray(dset, data, npoints)
+            arr = arr.reshape((npoints,) + dt.shape)
+
+        if arr.shape[:1] != (npoints,) or (dt.subdtype is not None and arr.shape[1:] != dt.shape):
+            msg = "setDatasetValuesByPointSelection, number of values doesn't match number of points"
+            self.log.info(msg)
+            raise IOError(errno.EINVAL, msg)
+
+        if obj_uuid in self._getAutoFilterDatasets() and npoints > 0:
+            dset = self._resolveAutoFilters(obj_uuid, dset, arr)
+
+        if npoints > 0:
+            self._writePointSelection(dset, coords, arr)
+
+        self._invalidateValueCache(obj_uuid)
 
         # update modified time
         self.setModifiedTime(obj_uuid)
         return True
 
+    """
+    _writePointSelection - write arr to the given coordinates using HDF5
+      point selections.  Large selections of chunked datasets are sorted
+      by chunk and written in batches of _POINT_BATCH_SIZE points.
+    """
+    def _writePointSelection(self, dset, coords, arr):
+        npoints = len(coords)
+        if dset.chunks and npoints > _POINT_BATCH_SIZE:
+            # stable sort by chunk index so that each batch touches few chunks
+            # (and duplicate points are still written in the given order)
+            chunk_index = coords // np.array(dset.chunks, dtype=np.uint64)
+            order = np.lexsort(chunk_index.T[::-1])
+            coords = coords[order]
+            arr = arr[order]
+        fspace = dset.id.get_space()
+        mtype = h5py.h5t.py_create(dset.dtype)  # needed for array types
+        for start in range(0, npoints, _POINT_BATCH_SIZE):
+            end = min(start + _POINT_BATCH_SIZE, npoints)
+            fspace.select_elements(coords[start:end])
+            mspace = h5py.h5s.create_simple((end - start,))
+            try:
+                dset.id.write(mspace, fspace, np.ascontiguousarray(arr[start:end]), mtype=mtype)
+            except TypeError as te:
+                self.log.info("h5py write exception: " + str(te))
+                raise IOError(errno.EINVAL, str(te))
+
     """
     createDataset - creates new dataset given shape and datatype
     Returns item
@@ -2646,6 +4846,11 @@ class Hdf5db:
         kwargs = {}  # key word arguments for h5py dataset creation
 
         fillvalue = None
+        auto_filters = False  # filters picked on first write
+        pipeline = []  # filters used, in the listed order
+        plugin_filters = False  # pipeline has filters h5py doesn't support
+        access_hint = None  # chunk dims picked for this access pattern
+        chunk_bytes = _CHUNK_TARGET_BYTES
 
         if creation_props is None:
             creation_props = {}  # create empty list for convience
@@ -2659,21 +4864,59 @@ class Hdf5db:
                 layout = creation_props["layout"]
                 if "dims" in layout:
                     kwargs['chunks'] = tuple(layout["dims"])
+            if "accessHint" in creation_props or "chunkBytes" in creation_props:
+                access_hint = creation_props.get("accessHint", "tile")
+                if access_hint not in _ACCESS_HINTS:
+                    msg = "invalid accessHint, expected one of: " + ", ".join(_ACCESS_HINTS)
+                    self.log.info(msg)
+                    raise IOError(errno.EINVAL, msg)
+                chunk_bytes = creation_props.get("chunkBytes", _CHUNK_TARGET_BYTES)
+                if not isinstance(chunk_bytes, six.integer_types) or chunk_bytes <= 0:
+                    msg = "invalid chunkBytes, expected a positive integer"
+                    self.log.info(msg)
+                    raise IOError(errno.EINVAL, msg)
             if "filters" in creation_props:
                 filter_props = creation_props["filters"]
+                if filter_props == "auto":
+                    # the pipeline is picked on the first write to the dataset,
+                    # see _resolveAutoFilters
+                    if creation_props.get("filterGoal", "balanced") not in _AUTO_FILTER_GOALS:
+                        msg = "invalid filterGoal, expected one of: " + ", ".join(_AUTO_FILTER_GOALS)
+                        self.log.info(msg)
+                        raise IOError(errno.EINVAL, msg)
+                    filter_props = []
+                    auto_filters = True
+                    if 'chunks' not in kwargs and datashape:
+                        kwargs['chunks'] = True  # filters need a chunked layout
                 for filter_prop in filter_props:
                     if "id" not in filter_prop:
                         msg = "filter id not provided"
                         self.log.info(msg)
                         raise IOError(errno.EINVAL, msg)
                     filter_id = filter_prop["id"]
-                    if filter_id not in _HDF_FILTERS:
+                    if filter_id in _HDF_FILTERS:
+                        hdf_filter = _HDF_FILTERS[filter_id]
+                    elif filter_prop.get("class") == "H5Z_FILTER_USER":
+                        hdf_filter = {'class': 'H5Z_FILTER_USER', 'plugin': True}
+                    else:
                         self.log.info("unknown filter id: " + str(filter_id) + " ignoring")
                         continue
 
-                    hdf_filter = _HDF_FILTERS[filter_id]
-
                     self.log.info("got filter: " + str(filter_id))
+                    if hdf_filter.get('plugin'):
+                        # filter provided by a plugin, added to the pipeline directly
+                        if not h5py.h5z.filter_avail(filter_id):
+                            self.log.info("filter plugin not available, filter: " + str(filter_id) + " will be ignored")
+                            continue
+                        parameters = filter_prop.get("parameters", [])
+                        if type(parameters) not in (list, tuple) or not all(
+                                isinstance(p, six.integer_types) and p >= 0 for p in parameters):
+                            msg = "invalid filter parameters for filter: " + str(filter_id)
+                            self.log.info(msg)
+                            raise IOError(errno.EINVAL, msg)
+                        pipeline.append({'id': filter_id, 'parameters': list(parameters)})
+                        plugin_filters = True
+                        continue
                     if "alias" not in hdf_filter:
                         self.log.info("unsupported filter id: " + str(filter_id) + " ignoring")
                         continue
@@ -2688,6 +4931,7 @@ class Hdf5db:
                             continue
 
                         kwargs['compression'] = filter_alias
+                        pipeline.append(filter_prop)
                         self.log.info("setting compression filter to: " + kwargs['compression'])
                         if filter_alias == "gzip":
                             # check for an optional compression value
@@ -2719,17 +4963,21 @@ class Hdf5db:
                     else:
                         if filter_alias == "shuffle":
                             kwargs['shuffle'] = True
+                            pipeline.append(filter_prop)
                         elif filter_alias == "fletcher32":
                             kwargs['fletcher32'] = True
+                            pipeline.append(filter_prop)
                         elif filter_alias == "scaleoffset":
                             if "scaleOffset" not in filter_prop:
                                 msg = "No scale_offset provided for scale offset filter"
                                 self.log(msg)
                                 raise IOError(errno.EINVAL, msg)
                             kwargs['scaleoffset'] = filter_prop["scaleOffset"]
+                            pipeline.append(filter_prop)
                         else:
                             self.log.info("Unexpected filter name: " + filter_alias + " , ignoring")
 
+
         dt_ref = self.createTypeFromItem(datatype)
         if dt_ref is None:
             msg = 'Unexpected error, no type returned'
@@ -2742,6 +4990,38 @@ class Hdf5db:
             # get the dtype prop, but use dt_ref for the actual dataset creation
             dt = dt_ref.dtype
 
+        if plugin_filters:
+            # h5py doesn't know the plugin filters and puts the filters it
+            # does know in its own order, so set up the whole pipeline (in
+            # the listed order) in the creation property list
+            for key in ('compression', 'compression_opts', 'shuffle', 'fletcher32', 'scaleoffset'):
+                kwargs.pop(key, None)
+            dcpl = h5py.h5p.create(h5py.h5p.DATASET_CREATE)
+            self._setFilters(dcpl, pipeline, dt)
+            kwargs['dcpl'] = dcpl
+            if 'chunks' not in kwargs:
+                kwargs['chunks'] = True  # filters need a chunked layout
+
+        layout = creation_props.get("layout", {})
+        shape = datashape
+        if isinstance(shape, six.integer_types):
+            shape = (shape,)
+        chunks = None
+        if access_hint and shape and kwargs.get('chunks') in (None, True) and \
+                layout.get("class", "H5D_CHUNKED") == "H5D_CHUNKED":
+            # no chunk dims given, pick them for the access pattern
+            if isinstance(max_shape, six.integer_types):
+                max_shape = (max_shape,)
+            chunks = _getChunkShape(shape, max_shape, dt.itemsize, access_hint, chunk_bytes)
+        if chunks:
+            self.log.info("chunk dims for access hint " + access_hint + ": " + str(chunks))
+            kwargs['chunks'] = chunks
+            layout = dict(layout)
+            layout["class"] = "H5D_CHUNKED"
+            layout["dims"] = list(chunks)
+            creation_props = dict(creation_props)  # don't modify the caller's props
+            creation_props["layout"] = layout
+
         if fillvalue and len(dt) > 1 and type(fillvalue) in (list, tuple):
             # for compound types, need to convert from list to dataset compatible element
 
@@ -2815,6 +5095,8 @@ class Hdf5db:
         # save creation props if any
         if creation_props:
             self.setDatasetCreationProps(obj_uuid, creation_props)
+        if auto_filters:
+            self._getAutoFilterDatasets().add(obj_uuid)
 
         # set timestamp
         now = time.time()
@@ -2828,6 +5110,358 @@ class Hdf5db:
         item['attributeCount'] = 0
         return item
 
+    """
+      _getAutoFilterDatasets - return set of uuids for datasets created with
+        "filters": "auto" that have not been written to yet
+    """
+    def _getAutoFilterDatasets(self):
+        if self._auto_filters is None:
+            self._auto_filters = set()
+            if not self.readonly and "{dataset_props}" in self.dbGrp:
+                attrs = self.dbGrp["{dataset_props}"].attrs
+                for obj_uuid in attrs:
+                    try:
+                        props = json.loads(attrs[obj_uuid])
+                    except ValueError:
+                        continue  # reported by getDatasetCreationProps
+                    if props.get("filters") == "auto":
+                        self._auto_filters.add(obj_uuid)
+        return self._auto_filters
+
+    """
+      _setFilters - add the given filters (in order) to a dataset creation
+        property list.  dtype is the type of the dataset (needed for the
+        scale offset filter).
+    """
+    def _setFilters(self, dcpl, filters, dtype=None):
+        for filter_prop in filters:
+            filter_id = filter_prop['id']
+            if filter_id == 1:
+                dcpl.set_deflate(filter_prop.get('level', 4))
+            elif filter_id == 2:
+                dcpl.set_shuffle()
+            elif filter_id == 3:
+                dcpl.set_fletcher32()
+            elif filter_id == 4:
+                coding = h5py.h5z.SZIP_NN_OPTION_MASK
+                if filter_prop.get('coding') == "H5_SZIP_EC_OPTION_MASK":
+                    coding = h5py.h5z.SZIP_EC_OPTION_MASK
+                dcpl.set_szip(coding, filter_prop.get('pixelsPerBlock', 8))
+            elif filter_id == 6:
+                if dtype is not None and dtype.kind in 'iu':
+                    dcpl.set_scaleoffset(h5py.h5z.SO_INT, filter_prop['scaleOffset'])
+                else:
+                    dcpl.set_scaleoffset(h5py.h5z.SO_FLOAT_DSCALE, filter_prop['scaleOffset'])
+            else:
+                parameters = tuple(filter_prop.get('parameters', ()))
+                dcpl.set_filter(filter_id, h5py.h5z.FLAG_OPTIONAL, parameters)
+
+    """
+      _getFilterSample - return up to _AUTO_FILTER_SAMPLE_CHUNKS chunk sized
+        blocks of arr (evenly spaced over the array) stacked into one array,
+        and the chunk shape to use for the sample
+    """
+    def _getFilterSample(self, dset, arr):
+        rank = len(dset.chunks)
+        chunk = dset.chunks
+        if arr.ndim != rank + len(dset.dtype.shape):
+            # singleton dimensions dropped from the json data
+            arr = arr.reshape(-1)
+            return (arr, (min(len(arr), int(np.prod(chunk))),))
+        counts = [arr.shape[i] // chunk[i] for i in range(rank)]
+        total = int(np.prod(counts))
+        if total == 0:
+            # selection is smaller than a chunk
+            return (arr, arr.shape[:rank])
+        nsample = min(total, _AUTO_FILTER_SAMPLE_CHUNKS)
+        blocks = []
+        for index in np.unique(np.linspace(0, total - 1, nsample).astype(int)):
+            pos = np.unravel_index(index, counts)
+            block = tuple(slice(pos[i] * chunk[i], (pos[i] + 1) * chunk[i]) for i in range(rank))
+            blocks.append(arr[block])
+        return (np.stack(blocks), (1,) + tuple(chunk))
+
+    """
+      _trialFilters - compress a sample of arr with each available candidate
+        pipeline and return the filter list that best meets the goal:
+          "ratio" - smallest stored size
+          "throughput" - fastest pipeline that saves at least 10%
+          "balanced" - fastest pipeline within 10% of the smallest size
+    """
+    def _trialFilters(self, dset, arr, goal):
+        (sample, sample_chunks) = self._getFilterSample(dset, arr)
+        # repeat small samples so the timings aren't just noise
+        repeats = min(max(_AUTO_FILTER_TRIAL_BYTES // max(sample.nbytes, 1), 1),
+                      _AUTO_FILTER_MAX_REPEATS)
+        results = []  # (nbytes, seconds, filters)
+        tmp = h5py.File(str(uuid.uuid1()), 'w', driver='core', backing_store=False)
+        try:
+            for filters in _AUTO_FILTER_CANDIDATES:
+                if not all(h5py.h5z.filter_avail(f['id']) for f in filters):
+                    continue
+                elapsed = None
+                for n in range(repeats):
+                    dcpl = h5py.h5p.create(h5py.h5p.DATASET_CREATE)
+                    self._setFilters(dcpl, filters)
+                    name = "trial" + str(len(results)) + "_" + str(n)
+                    start = _trial_clock()
+                    trial = tmp.create_dataset(name, data=sample, chunks=sample_chunks, dcpl=dcpl)
+                    tmp.flush()
+                    seconds = _trial_clock() - start
+                    if elapsed is None or seconds < elapsed:
+                        elapsed = seconds
+                    nbytes = trial.id.get_storage_size()
+                    del tmp[name]
+                results.append((nbytes, elapsed, list(filters)))
+        finally:
+            tmp.close()
+
+        raw_size = sample.nbytes
+        min_size = min(r[0] for r in results)
+        if goal == "ratio":
+            choices = [r for r in results if r[0] == min_size]
+        elif goal == "throughput":
+            choices = [r for r in results if r[0] <= raw_size * 0.9]
+        else:
+            choices = [r for r in results if r[0] <= min_size * 1.1]
+        if not choices:
+            return []  # data doesn't compress
+        choice = min(choices, key=lambda r: (r[1], r[0]))
+        self.log.info("auto filters: " + str(choice[2]) + " stored size: " +
+                      str(choice[0]) + " of " + str(raw_size) + " bytes")
+        return [dict(f) for f in choice[2]]
+
+    """
+      _resolveAutoFilters - pick the filter pipeline for a dataset created
+        with "filters": "auto" from the first data written to it.  HDF5 fixes
+        the pipeline when the dataset is created, so the (still empty and
+        anonymous) dataset is re-created with the chosen filters.  The choice
+        is recorded in the dataset creation properties.  arr is None for
+        chunks written with setDatasetChunkByUuid, which keep the pipeline
+        (i.e. no filters).  Called by every method that writes to a dataset;
+        returns the dataset to write to.
+    """
+    def _resolveAutoFilters(self, obj_uuid, dset, arr):
+        self._getAutoFilterDatasets().discard(obj_uuid)
+        props = self.getDatasetCreationProps(obj_uuid)
+        goal = props.get("filterGoal", "balanced")
+        col = self.dbGrp["{datasets}"]
+        filters = []
+        if not dset.chunks or dset.dtype.hasobject:
+            self.log.info("auto filters: not used for dataset: " + obj_uuid)
+        elif arr is None:
+            # chunks written directly are stored as given
+            self.log.info("auto filters: dataset: " + obj_uuid + " written by chunk, no filters used")
+        elif obj_uuid in col.attrs or obj_uuid not in col or len(dset.attrs) > 0 \
+                or h5py.h5o.get_info(dset.id).rc != 1 or dset.id.get_storage_size() > 0:
+            # other references to the dataset would be lost by re-creating it
+            self.log.info("auto filters: dataset: " + obj_uuid + " in use, no filters used")
+        else:
+            filters = self._trialFilters(dset, arr, goal)
+
+        if filters:
+            dcpl = dset.id.get_create_plist()  # keeps layout, fill value, etc.
+            self._setFilters(dcpl, filters)
+            tid = dset.id.get_type()
+            sid = dset.id.get_space()
+            addr = h5py.h5o.get_info(dset.id).addr
+            self._datasets.pop(obj_uuid, None)
+            dset = None
+            del col[obj_uuid]
+            name = obj_uuid
+            if six.PY3:
+                name = name.encode('utf-8')
+            dataset_id = h5py.h5d.create(col.id, name, tid, sid, dcpl=dcpl)
+            addrGrp = self.dbGrp["{addr}"]
+            del addrGrp.attrs[str(addr)]
+            addrGrp.attrs[str(h5py.h5o.get_info(dataset_id).addr)] = obj_uuid
+            dataset_id = None
+            dset = self._getDatasetObj(obj_uuid)
+
+        # record the choice in place of "auto"
+        props["filters"] = filters
+        self.dbGrp["{dataset_props}"].attrs[obj_uuid] = json.dumps(props)
+        return dset
+
+    """
+      _getAppendLengths - return dict of uuid to (axis, length) for datasets
+        that have been grown past their logical length by appends
+    """
+    def _getAppendLengths(self):
+        if self._append_lengths is None:
+            self._append_lengths = {}
+            if not self.readonly and "{dataset_lengths}" in self.dbGrp:
+                attrs = self.dbGrp["{dataset_lengths}"].attrs
+                for obj_uuid in attrs:
+                    (axis, length) = attrs[obj_uuid]
+                    self._append_lengths[obj_uuid] = (int(axis), int(length))
+        return self._append_lengths
+
+    """
+      _trimAppendedDataset - shrink the extent of the dataset to the
+        length written by appendDatasetValuesByUuid
+    """
+    def _trimAppendedDataset(self, obj_uuid):
+        (axis, length) = self._getAppendLengths().pop(obj_uuid)
+        dset = self._getDatasetObj(obj_uuid)
+        if dset is not None and dset.shape[axis] != length:
+            self.log.info("trimming dataset: " + obj_uuid + " to: " + str(length))
+            dset.resize(length, axis=axis)
+            self._invalidateValueCache(obj_uuid)
+        lengthsGrp = self.dbGrp["{dataset_lengths}"]
+        if obj_uuid in lengthsGrp.attrs:
+            del lengthsGrp.attrs[obj_uuid]
+
+    def _trimAppendedDatasets(self):
+        if self.readonly or not self._append_lengths:
+            return
+        for obj_uuid in list(self._append_lengths.keys()):
+            self._trimAppendedDataset(obj_uuid)
+
+    """
+      flush - write buffered dataset values and timestamps, trim datasets
+        grown by appendDatasetValuesByUuid and flush the file to disk
+    """
+    def flush(self):
+        self.log.info("flush")
+        self._flushWriteBuffers()
+        self._trimAppendedDatasets()
+        if self._timestamps is not None:
+            self._flushTimeStamps()
+        self.f.flush()
+        if self.dbf:
+            self.dbf.flush()
+
+    """
+      appendDatasetValuesByUuid - add data to the end of the dataset along
+        the given axis.
+
+        Space along axis is reserved in increasingly large steps, so most
+        appends don't need a resize.  The extent is trimmed to the data
+        written on flush, close, or when another method uses the extent or
+        selects values past the data written.  Until then the h5py object
+        returned by getDatasetObjByUuid includes the reserved space.
+
+        data - json values (or bytes if format is "binary") for one or more
+            slabs of the dataset along axis
+        returns - the new length of the dataset along axis
+    """
+    def appendDatasetValuesByUuid(self, obj_uuid, data, axis=0, format="json"):
+        self.initFile()
+        if self.readonly:
+            msg = "Unable to append to dataset (Updates are not allowed)"
+            self.log.info(msg)
+            raise IOError(errno.EPERM, msg)
+        if format not in ("json", "binary"):
+            msg = "only json and binary formats are supported"
+            self.log.info(msg)
+            raise IOError(errno.EINVAL, msg)
+        dset = self._getDatasetObj(obj_uuid)
+        if dset is None:
+            msg = "Dataset: " + obj_uuid + " not found"
+            self.log.info(msg)
+            raise IOError(errno.ENXIO, msg)
+        if obj_uuid in self._write_buffers:
+            self._flushWriteBuffer(obj_uuid)
+        rank = len(dset.shape)
+        if rank == 0 or axis < 0 or axis >= rank:
+            msg = "appendDatasetValuesByUuid: invalid axis: " + str(axis)
+            self.log.info(msg)
+            raise IOError(errno.EINVAL, msg)
+        if dset.dtype.hasobject and format == "binary":
+            msg = "Only JSON is supported for for this data type"
+            self.log.info(msg)
+            raise IOError(errno.EINVAL, msg)
+
+        if format == "binary" or isinstance(data, np.ndarray):
+            if not self._isBinaryData(data):
+                msg = "data must be a bytes-like object or numpy array for binary writing"
+                self.log.info(msg)
+                raise IOError(errno.EINVAL, msg)
+            arr = self._getValuesArray(dset, data)
+        else:
+            if len(dset.dtype) > 1 and type(data) in (list, tuple):
+                data = self.toTuple(rank, data)
+            elif h5py.check_dtype(ref=dset.dtype) in (h5py.Reference, h5py.RegionReference):
+                data = self.listToRef(data)
+            try:
+                arr = np.array(data, dtype=dset.dtype)
+            except (TypeError, ValueError) as e:
+                msg = "unable to convert data: " + str(e)
+                self.log.info(msg)
+                raise IOError(errno.EINVAL, msg)
+
+        lengths = self._getAppendLengths()
+        length = dset.shape[axis]
+        if obj_uuid in lengths:
+            if lengths[obj_uuid][0] != axis:
+                self._trimAppendedDataset(obj_uuid)  # appending along a new axis
+            else:
+                length = lengths[obj_uuid][1]
+
+        # number of elements in one slab along axis
+        slab_size = 1
+        for dim in range(rank):
+            if dim != axis:
+                slab_size *= dset.shape[dim]
+        # array types add dimensions to arr
+        type_size = int(np.prod(dset.dtype.shape))
+        count = 0
+        if slab_size > 0:
+            count = arr.size // (slab_size * type_size)
+        if count == 0 or count * slab_size * type_size != arr.size:
+            msg = "data shape doesn't match dataset shape"
+            self.log.info(msg)
+            raise IOError(errno.EINVAL, msg)
+        shape = list(dset.shape)
+        shape[axis] = count
+        data_rank = arr.ndim - len(dset.dtype.shape)
+        if format == "json" and data_rank == rank and list(arr.shape[:rank]) != shape:
+            msg = "data shape doesn't match dataset shape"
+            msg += "--data shape: " + str(arr.shape)
+            msg += "--expected shape: " + str(tuple(shape))
+            self.log.info(msg)
+            raise IOError(errno.EINVAL, msg)
+        arr = arr.reshape(tuple(shape) + dset.dtype.shape)
+
+        if obj_uuid in self._getAutoFilterDatasets():
+            dset = self._resolveAutoFilters(obj_uuid, dset, arr)
+
+        new_length = length + count
+        max_extent = dset.maxshape[axis]
+        if max_extent is not None and new_length > max_extent:
+            msg = "Unable to append to dataset, max extent exceeded"
+            self.log.info(msg)
+            raise IOError(errno.EINVAL, msg)
+        if new_length > dset.shape[axis]:
+            # grow geometrically so the number of resizes is logarithmic
+            capacity = max(new_length, 2 * dset.shape[axis])
+            if dset.chunks:
+                capacity = max(capacity, dset.chunks[axis])
+            if max_extent is not None:
+                capacity = min(capacity, max_extent)
+            self.log.info("growing dataset: " + obj_uuid + " to: " + str(capacity))
+            try:
+                dset.resize(capacity, axis=axis)
+            except (TypeError, ValueError) as e:
+                msg = "Unable to append to dataset: " + str(e)
+                self.log.info(msg)
+                raise IOError(errno.EINVAL, msg)
+
+        slices = [slice(None)] * rank
+        slices[axis] = slice(length, new_length)
+        dset[tuple(slices)] = arr
+
+        if "{dataset_lengths}" not in self.dbGrp:
+            self.dbGrp.create_group("{dataset_lengths}")
+        lengthsGrp = self.dbGrp["{dataset_lengths}"]
+        lengthsGrp.attrs.create(obj_uuid, np.array([axis, new_length], dtype='int64'))
+        lengths[obj_uuid] = (axis, new_length)
+        self._invalidateValueCache(obj_uuid)
+        self.setModifiedTime(obj_uuid)
+
+        return new_length
+
     """
     Resize existing Dataset
     """
@@ -2839,6 +5473,7 @@ class Hdf5db:
             self.log.info(msg)
             raise IOError(errno.EACESS, msg)
         dset = self.getDatasetObjByUuid(obj_uuid)  # will throw exception if not found
+        self._syncExtent(obj_uuid)
         if len(shape) != len(dset.shape):
             msg = "Unable to resize dataset, shape has wrong number of dimensions"
             self.log.info(msg)
@@ -2854,6 +5489,7 @@ class Hdf5db:
                 raise IOError(errno.EINVAL, msg)
 
         dset.resize(shape)  # resize
+        self._invalidateValueCache(obj_uuid)
 
         # update modified time
         self.setModifiedTime(obj_uuid)
@@ -2961,6 +5597,15 @@ class Hdf5db:
             self.log.error(msg)
             raise IOError(errno.EIO, msg)
 
+        self._datasets.pop(obj_uuid, None)
+        self._chunk_cache.pop(obj_uuid, None)
+        self._invalidateValueCache(obj_uuid)
+        self._write_buffers.pop(obj_uuid, None)
+        self._getAutoFilterDatasets().discard(obj_uuid)
+        if obj_uuid in self._getAppendLengths():
+            del self._append_lengths[obj_uuid]
+            del self.dbGrp["{dataset_lengths}"].attrs[obj_uuid]
+
         # note when the object was deleted
         self.setModifiedTime(obj_uuid)
 
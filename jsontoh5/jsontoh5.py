@@ -263,7 +263,8 @@ def main():
     # create the file, will raise IOError if there's a problem
     Hdf5db.createHDF5File(filename) 
 
-    with Hdf5db(filename, root_uuid=root_uuid, update_timestamps=False, app_logger=log) as db:
+    with Hdf5db(filename, root_uuid=root_uuid, update_timestamps=False, app_logger=log,
+                sparse_writes=True) as db:
         h5writer = Writeh5(db, h5json)
         h5writer.writeFile()
 
@@ -19,8 +19,13 @@ import os.path as op
 import stat
 import logging
 import shutil
+import struct
+import uuid
+import numpy as np
+import h5py
 
 from h5json import Hdf5db
+from h5json.hdf5db import _HDF_FILTERS
 
 UUID_LEN = 36  # length for uuid strings
 
@@ -359,6 +364,781 @@ class Hdf5dbTest(unittest.TestCase):
             self.assertEqual(len(d112_data), 80) # 20x(4 byte type)
              
                
+    def testReadDatasetBuffer(self):
+         filepath = getFile('tall.h5', 'readdatasetbuffer.h5')
+         with Hdf5db(filepath, app_logger=self.log) as db:
+            d111Uuid = db.getUUIDByPath('/g1/g1.1/dset1.1.1')
+            binary = db.getDatasetValuesByUuid(d111Uuid, format="binary")
+            buf = db.getDatasetValuesByUuid(d111Uuid, format="buffer")
+            self.assertTrue(type(buf) is memoryview)
+            self.assertEqual(len(buf), 400)
+            self.assertEqual(buf.tobytes(), binary)
+
+            # read into a caller supplied buffer
+            slices = (slice(1, 3, 1), slice(0, 10, 1))
+            out = bytearray(100)
+            buf = db.getDatasetValuesByUuid(d111Uuid, slices, format="buffer", out=out)
+            self.assertEqual(len(buf), 80)
+            self.assertEqual(bytes(out[:80]), db.getDatasetValuesByUuid(d111Uuid, slices, format="binary"))
+            try:
+                db.getDatasetValuesByUuid(d111Uuid, format="buffer", out=bytearray(10))
+                self.assertTrue(False)  # shouldn't get here
+            except IOError as e:
+                self.assertEqual(e.errno, errno.EINVAL)
+
+         filepath = getFile('dset_gzip.h5', 'readdatasetbuffergzip.h5')
+         with Hdf5db(filepath, app_logger=self.log) as db:
+            dset_uuid = db.getUUIDByPath('/dset1')
+            slices = (slice(0, 10, 1), slice(5, 25, 2))
+            binary = db.getDatasetValuesByUuid(dset_uuid, slices, format="binary")
+            out = bytearray(len(binary))
+            db.getDatasetValuesByUuid(dset_uuid, slices, format="buffer", out=out)
+            self.assertEqual(bytes(out), binary)
+
+    def testReadStridedChunkedDataset(self):
+         filepath = getFile('h5ex_d_gzip.h5', 'readstridedchunkeddataset.h5')
+         with Hdf5db(filepath, app_logger=self.log) as db:
+            dset_uuid = db.getUUIDByPath('/DS1')  # 32x64 with 4x8 chunks
+            values = db.getDatasetValuesByUuid(dset_uuid)
+            for slices in ((slice(0, 32, 2), slice(0, 64, 2)),
+                           (slice(1, 31, 5), slice(3, 60, 9)),
+                           (slice(5, 6, 3), slice(0, 64, 64))):
+                expected = [row[slices[1]] for row in values[slices[0]]]
+                self.assertEqual(db.getDatasetValuesByUuid(dset_uuid, slices), expected)
+                binary = db.getDatasetValuesByUuid(dset_uuid, slices, format="binary")
+                self.assertEqual(len(binary), len(expected) * len(expected[0]) * 4)
+                out = bytearray(len(binary))
+                db.getDatasetValuesByUuid(dset_uuid, slices, format="buffer", out=out)
+                self.assertEqual(bytes(out), binary)
+
+    def testChunkCache(self):
+         filepath = getFile('dset_gzip.h5', 'chunkcache.h5')
+         with Hdf5db(filepath, app_logger=self.log, rdcc_nbytes=2*1024*1024) as db:
+            dset_uuid = db.getUUIDByPath('/dset1')  # 1000x1000 float64, 100x100 chunks
+            cache = db.getDatasetChunkCache(dset_uuid)
+            self.assertEqual(cache['nbytes'], 2*1024*1024)
+
+            db.setDatasetChunkCache(dset_uuid, 8*1024*1024, w0=0.5)
+            cache = db.getDatasetChunkCache(dset_uuid)
+            self.assertEqual(cache['nbytes'], 8*1024*1024)
+            self.assertEqual(cache['w0'], 0.5)
+            values = db.getDatasetValuesByUuid(dset_uuid, (slice(0, 10, 1), slice(0, 1000, 1)))
+            self.assertEqual(len(values), 10)
+
+            try:
+                db.setDatasetChunkCache(db.getUUIDByPath('/dset1'), -1)
+                self.assertTrue(False)  # shouldn't get here
+            except IOError as e:
+                self.assertEqual(e.errno, errno.EINVAL)
+
+         with Hdf5db(filepath, app_logger=self.log, auto_chunk_cache=True) as db:
+            dset_uuid = db.getUUIDByPath('/dset1')
+            # a row of chunks (10 chunks of 80000 bytes) fits in the default cache
+            cache = db.getDatasetChunkCache(dset_uuid)
+            self.assertEqual(cache['nbytes'], 1024*1024)
+            # read touching 20 chunks grows the cache
+            db.getDatasetValuesByUuid(dset_uuid, (slice(50, 150, 1), slice(0, 1000, 1)))
+            cache = db.getDatasetChunkCache(dset_uuid)
+            self.assertEqual(cache['nbytes'], 1600000)
+
+    def testValueCache(self):
+         filepath = getFile('tall.h5', 'valuecache.h5')
+         with Hdf5db(filepath, app_logger=self.log, value_cache_bytes=1024) as db:
+            dset_uuid = db.getUUIDByPath('/g1/g1.1/dset1.1.1')  # 10x10 i*j
+            slices = (slice(0, 2, 1), slice(0, 10, 1))
+            values = db.getDatasetValuesByUuid(dset_uuid, slices)
+            self.assertEqual(values[1][9], 9)
+            values[1][9] = -1  # caller changes don't affect the cache
+            values = db.getDatasetValuesByUuid(dset_uuid, slices)
+            self.assertEqual(values[1][9], 9)
+            self.assertEqual(len(db._value_cache), 1)
+
+            # writes invalidate cached values
+            db.setDatasetValuesByUuid(dset_uuid, [[42]*10], (slice(1, 2, 1), slice(0, 10, 1)))
+            self.assertEqual(len(db._value_cache), 0)
+            values = db.getDatasetValuesByUuid(dset_uuid, slices)
+            self.assertEqual(values[1][9], 42)
+            db.setDatasetValuesByPointSelection(dset_uuid, [7], [[1, 9]])
+            values = db.getDatasetValuesByUuid(dset_uuid, slices)
+            self.assertEqual(values[1][9], 7)
+
+            # binary reads are cached separately from json reads
+            binary = db.getDatasetValuesByUuid(dset_uuid, slices, format="binary")
+            self.assertEqual(len(binary), 80)
+            self.assertEqual(len(db._value_cache), 2)
+
+            # least recently used entries are evicted to stay within bounds
+            for i in range(10):
+                db.getDatasetValuesByUuid(dset_uuid, (slice(i, i+1, 1), slice(0, 10, 1)), format="binary")
+            self.assertTrue(db._value_cache_size <= 1024)
+            self.assertTrue(db._value_cache_size > 0)
+
+    def testDatasetChunkPassthrough(self):
+         filepath = getFile('h5ex_d_gzip.h5', 'chunkpassthrough.h5')
+         with Hdf5db(filepath, app_logger=self.log) as db:
+            src_uuid = db.getUUIDByPath('/DS1')  # 32x64 int32, 4x8 gzip chunks
+            offsets = db.getDatasetChunkOffsetsByUuid(src_uuid)
+            self.assertEqual(len(offsets), 64)
+            (filter_mask, data) = db.getDatasetChunkByUuid(src_uuid, (4, 8))
+            self.assertEqual(filter_mask, 0)
+            self.assertTrue(len(data) < 4*8*4)  # still compressed
+
+            # copy the compressed chunks to a new dataset with the same filters
+            datatype = { 'charSet': 'H5T_CSET_ASCII',
+                     'class': 'H5T_INTEGER',
+                     'base': 'H5T_STD_I32LE'}
+            creation_props = {'layout': {'class': 'H5D_CHUNKED', 'dims': [4, 8]},
+                              'filters': [{'id': 1, 'level': 9}]}
+            item = db.createDataset(datatype, (32, 64), creation_props=creation_props)
+            tgt_uuid = item['id']
+            for offset in offsets:
+                (filter_mask, data) = db.getDatasetChunkByUuid(src_uuid, offset)
+                db.setDatasetChunkByUuid(tgt_uuid, offset, data, filter_mask=filter_mask)
+            self.assertEqual(db.getDatasetValuesByUuid(tgt_uuid),
+                             db.getDatasetValuesByUuid(src_uuid))
+
+            for offset in ((1, 0), (32, 0), (0,)):
+                try:
+                    db.getDatasetChunkByUuid(src_uuid, offset)
+                    self.assertTrue(False)  # shouldn't get here
+                except IOError as e:
+                    self.assertEqual(e.errno, errno.EINVAL)
+
+    def testParallelChunkWrite(self):
+         filepath = getFile('tall.h5', 'parallelchunkwrite.h5')
+         with Hdf5db(filepath, app_logger=self.log, chunk_threads=2) as db:
+            datatype = { 'charSet': 'H5T_CSET_ASCII',
+                     'class': 'H5T_INTEGER',
+                     'base': 'H5T_STD_I32BE'}
+            creation_props = {'layout': {'class': 'H5D_CHUNKED', 'dims': [4, 8]},
+                              'filters': [{'id': 2}, {'id': 1, 'level': 5}]}
+            item = db.createDataset(datatype, (10, 20), creation_props=creation_props)
+            dset_uuid = item['id']
+            data = []
+            for i in range(10):
+                data.append(list(range(i*20, (i+1)*20)))
+            # chunk aligned, with partial edge chunks
+            db.setDatasetValuesByUuid(dset_uuid, data)
+            self.assertEqual(db.getDatasetValuesByUuid(dset_uuid), data)
+            (filter_mask, chunk) = db.getDatasetChunkByUuid(dset_uuid, (8, 16))
+            self.assertTrue(len(chunk) < 4*8*4)
+
+            # unaligned selection falls back to h5py
+            db.setDatasetValuesByUuid(dset_uuid, [[-1]*3]*2, (slice(1, 3, 1), slice(2, 5, 1)))
+            values = db.getDatasetValuesByUuid(dset_uuid)
+            self.assertEqual(values[2][4], -1)
+            self.assertEqual(values[2][5], 45)
+            self.assertEqual(values[9][19], 199)
+
+    def testParallelChunkRead(self):
+         filepath = getFile('dset_gzip.h5', 'parallelchunkread.h5')
+         selections = (Ellipsis,
+                       (slice(50, 450, 3), slice(0, 1000, 7)),
+                       (slice(95, 105, 1), 999),
+                       (0, slice(0, 1000, 1)))
+         expected = []
+         with Hdf5db(filepath, app_logger=self.log) as db:
+            dset_uuid = db.getUUIDByPath('/dset1')  # 1000x1000 float64, 100x100 chunks
+            for slices in selections:
+                expected.append(db.getDatasetValuesByUuid(dset_uuid, slices, format="binary"))
+         with Hdf5db(filepath, app_logger=self.log, chunk_threads=2) as db:
+            dset_uuid = db.getUUIDByPath('/dset1')
+            for i in range(len(selections)):
+                values = db.getDatasetValuesByUuid(dset_uuid, selections[i], format="binary")
+                self.assertEqual(values, expected[i])
+
+            # chunks that haven't been written read as the fill value
+            datatype = { 'charSet': 'H5T_CSET_ASCII',
+                     'class': 'H5T_INTEGER',
+                     'base': 'H5T_STD_I16LE'}
+            creation_props = {'fillValue': 7,
+                              'layout': {'class': 'H5D_CHUNKED', 'dims': [5]},
+                              'filters': [{'id': 1}]}
+            item = db.createDataset(datatype, (12,), creation_props=creation_props)
+            db.setDatasetValuesByUuid(item['id'], [1, 2, 3, 4, 5], (slice(5, 10, 1),))
+            values = db.getDatasetValuesByUuid(item['id'])
+            self.assertEqual(values, [7, 7, 7, 7, 7, 1, 2, 3, 4, 5, 7, 7])
+
+    def testAppendDataset(self):
+         filepath = getFile('empty.h5', 'appenddataset.h5')
+         with Hdf5db(filepath, app_logger=self.log) as db:
+            creation_props = {'layout': {'class': 'H5D_CHUNKED', 'dims': [4, 3]}}
+            rsp = db.createDataset("H5T_STD_I32LE", (0, 3), max_shape=(None, 3),
+                                   creation_props=creation_props)
+            dset_uuid = rsp['id']
+            for i in range(10):
+                length = db.appendDatasetValuesByUuid(dset_uuid, [[i, i, i]])
+                self.assertEqual(length, i+1)
+            length = db.appendDatasetValuesByUuid(dset_uuid, [[10, 10, 10], [11, 11, 11]])
+            self.assertEqual(length, 12)
+            data = b''
+            for i in range(12, 15):
+                data += struct.pack('<iii', i, i, i)
+            length = db.appendDatasetValuesByUuid(dset_uuid, data, format="binary")
+            self.assertEqual(length, 15)
+            # space is reserved in the file, but the logical length is recorded
+            self.assertEqual(db.f["__db__/{dataset_lengths}"].attrs[dset_uuid][1], 15)
+
+            # reads within the appended data keep the reserved space
+            values = db.getDatasetValuesByUuid(dset_uuid, (slice(10, 15, 1), slice(0, 3, 1)))
+            self.assertEqual(values[4], [14, 14, 14])
+            self.assertEqual(db.getDatasetObjByUuid(dset_uuid).shape, (16, 3))
+
+            # other methods see the appended extent
+            item = db.getDatasetItemByUuid(dset_uuid)
+            self.assertEqual(item['shape']['dims'], (15, 3))
+            values = db.getDatasetValuesByUuid(dset_uuid)
+            self.assertEqual(len(values), 15)
+            self.assertEqual(values[14], [14, 14, 14])
+
+            try:
+                db.appendDatasetValuesByUuid(dset_uuid, [[1, 2]])
+                self.assertTrue(False)  # shouldn't get here
+            except IOError as e:
+                self.assertEqual(e.errno, errno.EINVAL)
+            try:
+                db.appendDatasetValuesByUuid(dset_uuid, [[1, 2, 3]], axis=1)
+                self.assertTrue(False)  # max extent exceeded
+            except IOError as e:
+                self.assertEqual(e.errno, errno.EINVAL)
+
+            mtime = db.getModifiedTime(dset_uuid)
+            time.sleep(1)
+            db.appendDatasetValuesByUuid(dset_uuid, [15, 15, 15])
+            self.assertTrue(db.getModifiedTime(dset_uuid) > mtime)  # set by the append
+
+         # extent is trimmed on close
+         with Hdf5db(filepath, app_logger=self.log) as db:
+            dset = db.getDatasetObjByUuid(dset_uuid)
+            self.assertEqual(dset.shape, (16, 3))
+            self.assertEqual(list(dset[15]), [15, 15, 15])
+
+    def testDatasetWriteBuffer(self):
+         filepath = getFile('empty.h5', 'datasetwritebuffer.h5')
+         with Hdf5db(filepath, app_logger=self.log) as db:
+            rsp = db.createDataset("H5T_STD_I32LE", (10, 10))
+            dset_uuid = rsp['id']
+            db.setDatasetWriteBuffer(dset_uuid, 1024, max_age=60)
+            dset = db._getDatasetObj(dset_uuid)
+            for i in range(10):
+                # row by row, with the last row written twice
+                db.setDatasetValuesByUuid(dset_uuid, [[i]*10], (slice(i, i+1, 1), slice(0, 10, 1)))
+            db.setDatasetValuesByUuid(dset_uuid, [[42]*5], (slice(9, 10, 1), slice(5, 10, 1)))
+            # a write within the merged rows
+            db.setDatasetValuesByUuid(dset_uuid, [7], (slice(5, 6, 1), slice(3, 4, 1)))
+            write_buffer = db._write_buffers[dset_uuid]
+            self.assertEqual(len(write_buffer['blocks']), 1)  # all merged
+            self.assertEqual(dset[9, 9], 0)  # not written yet
+
+            # reads see the buffered values
+            values = db.getDatasetValuesByUuid(dset_uuid)
+            self.assertEqual(values[0], [0]*10)
+            self.assertEqual(values[5][3], 7)
+            self.assertEqual(values[9], [9]*5 + [42]*5)
+            self.assertEqual(len(write_buffer['blocks']), 0)
+
+            # buffer is written when it grows past the size limit
+            db.setDatasetWriteBuffer(dset_uuid, 64)
+            db.setDatasetValuesByUuid(dset_uuid, [[1]*10]*2, (slice(0, 2, 1), slice(0, 10, 1)))
+            self.assertEqual(len(db._write_buffers[dset_uuid]['blocks']), 0)
+            self.assertEqual(dset[1, 9], 1)
+
+            # writes through other methods write the buffer first
+            db.setDatasetValuesByUuid(dset_uuid, [[2]], (slice(0, 1, 1), slice(0, 1, 1)))
+            db.setDatasetValuesByPointSelection(dset_uuid, [3], [[2, 8]])
+            self.assertEqual(dset[0, 0], 2)
+            self.assertEqual(dset[2, 8], 3)
+
+            # strided writes write the buffer, then go to the file
+            db.setDatasetWriteBuffer(dset_uuid, 1024, max_age=60)
+            db.setDatasetValuesByUuid(dset_uuid, [[5]], (slice(1, 2, 1), slice(0, 1, 1)))
+            db.setDatasetValuesByUuid(dset_uuid, [[6], [6], [6]], (slice(4, 10, 2), slice(0, 1, 1)))
+            self.assertEqual(len(db._write_buffers[dset_uuid]['blocks']), 0)
+            self.assertEqual([dset[i, 0] for i in range(1, 9)], [5, 2, 3, 6, 5, 6, 7, 6])
+
+            # data must match the selection shape
+            try:
+                db.setDatasetValuesByUuid(dset_uuid, [1, 2, 3], (slice(0, 1, 1), slice(0, 2, 1)))
+                self.assertTrue(False)  # expected exception
+            except IOError as e:
+                self.assertEqual(e.errno, errno.EINVAL)
+
+            # expired buffers are written by the next call to any method
+            db.setDatasetWriteBuffer(dset_uuid, 1024, max_age=0.01)
+            db.setDatasetValuesByUuid(dset_uuid, [[11]], (slice(8, 9, 1), slice(9, 10, 1)))
+            self.assertEqual(dset[8, 9], 8)
+            time.sleep(0.05)
+            db.getUUIDByPath('/')
+            self.assertEqual(dset[8, 9], 11)
+
+            # merging keeps later overlapping writes in front of older values
+            rsp = db.createDataset("H5T_STD_I32LE", (4, 8))
+            overlap_uuid = rsp['id']
+            db.setDatasetWriteBuffer(overlap_uuid, 4096, max_age=60)
+            db.setDatasetValuesByUuid(overlap_uuid, [[1]*5]*3, (slice(0, 3, 1), slice(0, 5, 1)))
+            db.setDatasetValuesByUuid(overlap_uuid, [[2]*5]*3, (slice(1, 4, 1), slice(2, 7, 1)))
+            db.setDatasetValuesByUuid(overlap_uuid, [[3]*3]*3, (slice(0, 3, 1), slice(4, 7, 1)))
+            values = db.getDatasetValuesByUuid(overlap_uuid)
+            self.assertEqual(values[0], [1, 1, 1, 1, 3, 3, 3, 0])
+            self.assertEqual(values[1], [1, 1, 2, 2, 3, 3, 3, 0])
+            self.assertEqual(values[3], [0, 0, 2, 2, 2, 2, 2, 0])
+
+            # buffered blocks are written as whole chunks, once per chunk
+            creation_props = {'layout': {'class': 'H5D_CHUNKED', 'dims': [4, 4]}}
+            rsp = db.createDataset("H5T_STD_I32LE", (10, 10), creation_props=creation_props)
+            chunked_uuid = rsp['id']
+            db.setDatasetValuesByUuid(chunked_uuid, [[1]*10]*10)
+            db.setDatasetWriteBuffer(chunked_uuid, 1024, max_age=60)
+            db.setDatasetValuesByUuid(chunked_uuid, [[2, 2]], (slice(1, 2, 1), slice(1, 3, 1)))
+            db.setDatasetValuesByUuid(chunked_uuid, [[3]], (slice(2, 3, 1), slice(2, 3, 1)))
+            db.setDatasetValuesByUuid(chunked_uuid, [[4]], (slice(9, 10, 1), slice(9, 10, 1)))
+            writes = []
+            write_values = db._writeDatasetValues
+            db._writeDatasetValues = lambda dset, slices, arr: (writes.append(slices),
+                                                                write_values(dset, slices, arr))
+            db.flush()
+            del db._writeDatasetValues
+            self.assertEqual(writes, [(slice(0, 4, 1), slice(0, 4, 1)),
+                                      (slice(8, 10, 1), slice(8, 10, 1))])
+            values = db.getDatasetValuesByUuid(chunked_uuid)
+            self.assertEqual(values[1][:4], [1, 2, 2, 1])
+            self.assertEqual(values[2][:4], [1, 1, 3, 1])
+            self.assertEqual(values[9][8:], [1, 4])
+
+            db.setDatasetWriteBuffer(dset_uuid, 1024, max_age=60)
+            db.setDatasetValuesByUuid(dset_uuid, [[4]], (slice(3, 4, 1), slice(0, 1, 1)))
+
+         with Hdf5db(filepath, app_logger=self.log) as db:
+            # buffered values are written on close
+            values = db.getDatasetValuesByUuid(dset_uuid)
+            self.assertEqual(values[3][0], 4)
+
+    def testWriteBinaryBuffers(self):
+         filepath = getFile('empty.h5', 'writebinarybuffers.h5')
+         with Hdf5db(filepath, app_logger=self.log) as db:
+            rsp = db.createDataset("H5T_STD_I16LE", (4, 3))
+            dset_uuid = rsp['id']
+            data = bytearray(struct.pack('<6h', 1, 2, 3, 4, 5, 6))
+            db.setDatasetValuesByUuid(dset_uuid, data, (slice(0, 2, 1), slice(0, 3, 1)), format="binary")
+            view = memoryview(struct.pack('<3h', 7, 8, 9))
+            db.setDatasetValuesByUuid(dset_uuid, view, (slice(2, 3, 1), slice(0, 3, 1)), format="binary")
+            # numpy arrays are converted to the dataset type if needed
+            arr = np.array([10, 11, 12], dtype='>i4')
+            db.setDatasetValuesByUuid(dset_uuid, arr, (slice(3, 4, 1), slice(0, 3, 1)))
+            values = db.getDatasetValuesByUuid(dset_uuid)
+            self.assertEqual(values, [[1, 2, 3], [4, 5, 6], [7, 8, 9], [10, 11, 12]])
+            db.setDatasetValuesByPointSelection(dset_uuid, bytearray(struct.pack('<2h', -1, -2)),
+                                                [[0, 0], [3, 2]], format="binary")
+            values = db.getDatasetValuesByUuid(dset_uuid)
+            self.assertEqual(values[0][0], -1)
+            self.assertEqual(values[3][2], -2)
+
+            for data in (u'abcdefghijkl', bytearray(10), np.zeros((2, 3), dtype='S4')):
+                try:
+                    db.setDatasetValuesByUuid(dset_uuid, data, (slice(0, 2, 1), slice(0, 3, 1)), format="binary")
+                    self.assertTrue(False)  # shouldn't get here
+                except IOError as e:
+                    self.assertEqual(e.errno, errno.EINVAL)
+
+            # array type
+            datatype = {'class': 'H5T_ARRAY', 'base': 'H5T_STD_I32LE', 'dims': [2]}
+            rsp = db.createDataset(datatype, (3,), max_shape=(None,))
+            dset_uuid = rsp['id']
+            data = bytearray(struct.pack('<6i', 1, 2, 3, 4, 5, 6))
+            db.setDatasetValuesByUuid(dset_uuid, data, format="binary")
+            values = db.getDatasetValuesByUuid(dset_uuid)
+            self.assertEqual(values, [[1, 2], [3, 4], [5, 6]])
+            db.appendDatasetValuesByUuid(dset_uuid, bytearray(struct.pack('<2i', 7, 8)), format="binary")
+            values = db.getDatasetValuesByUuid(dset_uuid)
+            self.assertEqual(values[3], [7, 8])
+
+    def testDatasetSelections(self):
+         filepath = getFile('tall.h5', 'datasetselections.h5')
+         with Hdf5db(filepath, app_logger=self.log) as db:
+            dset_uuid = db.getUUIDByPath('/g1/g1.1/dset1.1.1')  # 10x10 i*j
+            selections = [(slice(0, 2, 1), slice(0, 3, 1)),
+                          (slice(8, 10, 1), slice(1, 10, 4)),
+                          (slice(1, 3, 1), slice(2, 4, 1)),  # overlaps the first
+                          [5, slice(0, 10, 3)]]
+            values = db.getDatasetValuesBySelections(dset_uuid, selections)
+            self.assertEqual(len(values), 4)
+            for i in range(len(selections)):
+                self.assertEqual(values[i], db.getDatasetValuesByUuid(dset_uuid, tuple(selections[i])))
+            values = db.getDatasetValuesBySelections(dset_uuid, selections, format="binary")
+            self.assertEqual(values[3], struct.pack('>4i', 0, 15, 30, 45))
+
+            data = [[[-1, -1, -1], [-1, -1, -1]],
+                    [[-2, -2, -2], [-2, -2, -2]],
+                    [[-3, -3], [-3, -3]],
+                    [-4, -4, -4, -4]]
+            db.setDatasetValuesBySelections(dset_uuid, selections, data)
+            values = db.getDatasetValuesByUuid(dset_uuid)
+            self.assertEqual(values[0][:4], [-1, -1, -1, 0])
+            self.assertEqual(values[1][:4], [-1, -1, -3, -3])
+            self.assertEqual(values[9][:6], [0, -2, 18, 27, 36, -2])
+            self.assertEqual(values[5], [-4, 5, 10, -4, 20, 25, -4, 35, 40, -4])
+
+            try:
+                db.setDatasetValuesBySelections(dset_uuid, selections[:2], data)
+                self.assertTrue(False)  # shouldn't get here
+            except IOError as e:
+                self.assertEqual(e.errno, errno.EINVAL)
+            try:
+                db.setDatasetValuesBySelections(dset_uuid, [(slice(0, 11, 1), slice(0, 1, 1))], [[1]*11])
+                self.assertTrue(False)  # shouldn't get here
+            except IOError as e:
+                self.assertEqual(e.errno, errno.EINVAL)
+
+    def testSparseWrites(self):
+         filepath = getFile('empty.h5', 'sparsewrites.h5')
+         for chunk_threads in (0, 2):
+            with Hdf5db(filepath, app_logger=self.log, sparse_writes=True,
+                        chunk_threads=chunk_threads) as db:
+                creation_props = {'fillValue': -1,
+                                  'layout': {'class': 'H5D_CHUNKED', 'dims': [10, 10]},
+                                  'filters': [{'id': 1}]}
+                rsp = db.createDataset("H5T_IEEE_F64LE", (100, 100), creation_props=creation_props)
+                dset_uuid = rsp['id']
+                dset = db.getDatasetObjByUuid(dset_uuid)
+                arr = np.full((100, 100), -1.0)
+                arr[5, 5] = 1.0
+                arr[95, 99] = 2.0
+                db.setDatasetValuesByUuid(dset_uuid, arr.tolist())
+                self.assertEqual(dset.id.get_num_chunks(), 2)
+                values = db.getDatasetValuesByUuid(dset_uuid)
+                self.assertEqual(values, arr.tolist())
+
+                # allocated chunks are still written with fill values
+                db.setDatasetValuesByUuid(dset_uuid, [[-1.0]*10]*10, (slice(0, 10, 1), slice(0, 10, 1)))
+                values = db.getDatasetValuesByUuid(dset_uuid, (slice(5, 6, 1), slice(5, 6, 1)))
+                self.assertEqual(values, [[-1.0]])
+                # partial chunk writes
+                db.setDatasetValuesByUuid(dset_uuid, [[-1.0, 3.0]], (slice(50, 51, 1), slice(19, 21, 1)))
+                self.assertEqual(dset.id.get_num_chunks(), 3)
+                values = db.getDatasetValuesByUuid(dset_uuid, (slice(50, 51, 1), slice(18, 22, 1)))
+                self.assertEqual(values, [[-1.0, -1.0, 3.0, -1.0]])
+
+    def testCreateDatasetPluginFilters(self):
+         filepath = getFile('empty.h5', 'createdatasetpluginfilters.h5')
+         # use lzf in place of a filter plugin, so the test doesn't need one installed
+         _HDF_FILTERS[32000]['plugin'] = True
+         try:
+            with Hdf5db(filepath, app_logger=self.log) as db:
+                creation_props = {'layout': {'class': 'H5D_CHUNKED', 'dims': [10, 10]},
+                                  'filters': [{'id': 1, 'level': 6}, {'id': 32000},
+                                              {'id': 2}, {'id': 3},
+                                              {'id': 32017, 'class': 'H5Z_FILTER_USER'}]}
+                rsp = db.createDataset("H5T_STD_I32LE", (100, 100), creation_props=creation_props)
+                dset_uuid = rsp['id']
+                db.setDatasetValuesByUuid(dset_uuid, [list(range(100))]*100)
+                self.assertEqual(db.getDatasetValuesByUuid(dset_uuid)[99][99], 99)
+                props = db.getHDF5DatasetCreationProperties(dset_uuid, 'H5T_INTEGER')
+                # filters are kept in the listed order, unavailable plugin is ignored
+                self.assertEqual([item['id'] for item in props['filters']], [1, 32000, 2, 3])
+                self.assertEqual(props['filters'][0]['level'], 6)
+
+                # szip options are kept with a plugin in the pipeline
+                szip_available = h5py.h5z.filter_avail(4)
+                szip_props = {'layout': {'class': 'H5D_CHUNKED', 'dims': [10, 10]},
+                              'filters': [{'id': 4, 'coding': 'H5_SZIP_EC_OPTION_MASK',
+                                           'pixelsPerBlock': 16}, {'id': 32000}]}
+                if szip_available:
+                    rsp = db.createDataset("H5T_STD_I32LE", (100, 100), creation_props=szip_props)
+                    szip_uuid = rsp['id']
+                    db.setDatasetValuesByUuid(szip_uuid, [list(range(100))]*100)
+                    self.assertEqual(db.getDatasetValuesByUuid(szip_uuid)[99][99], 99)
+                    plist = db.getDatasetObjByUuid(szip_uuid).id.get_create_plist()
+                    cd_values = plist.get_filter_by_id(4)[1]
+                    self.assertEqual(cd_values[1], 16)  # pixels per block
+
+                try:
+                    creation_props['filters'][1]['parameters'] = ['fast']
+                    db.createDataset("H5T_STD_I32LE", (100, 100), creation_props=creation_props)
+                    self.assertTrue(False)  # shouldn't get here
+                except IOError as e:
+                    self.assertEqual(e.errno, errno.EINVAL)
+         finally:
+            del _HDF_FILTERS[32000]['plugin']
+
+    @unittest.skipUnless(h5py.h5z.filter_avail(32015), "zstd filter plugin not available")
+    def testCreateDatasetZstdFilter(self):
+         filepath = getFile('empty.h5', 'createdatasetzstdfilter.h5')
+         with Hdf5db(filepath, app_logger=self.log) as db:
+            creation_props = {'layout': {'class': 'H5D_CHUNKED', 'dims': [10, 10]},
+                              'filters': [{'id': 2}, {'id': 32015, 'parameters': [3]}]}
+            rsp = db.createDataset("H5T_STD_I32LE", (100, 100), creation_props=creation_props)
+            dset_uuid = rsp['id']
+            db.setDatasetValuesByUuid(dset_uuid, [list(range(100))]*100)
+            self.assertEqual(db.getDatasetValuesByUuid(dset_uuid)[99][99], 99)
+            props = db.getHDF5DatasetCreationProperties(dset_uuid, 'H5T_INTEGER')
+            self.assertEqual([item['id'] for item in props['filters']], [2, 32015])
+            zstd_filter = props['filters'][1]
+            self.assertEqual(zstd_filter['class'], 'H5Z_FILTER_ZSTD')
+            self.assertEqual(zstd_filter['parameters'][0], 3)
+
+    def testCreateDatasetAutoFilters(self):
+         filepath = getFile('empty.h5', 'createdatasetautofilters.h5')
+         with Hdf5db(filepath, app_logger=self.log) as db:
+            root_uuid = db.getUUIDByPath('/')
+            creation_props = {'filters': 'auto', 'filterGoal': 'ratio'}
+            rsp = db.createDataset("H5T_STD_I32LE", (200, 100), creation_props=creation_props)
+            dset_uuid = rsp['id']
+            self.assertEqual(db.getDatasetCreationProps(dset_uuid)['filters'], 'auto')
+            db.setDatasetValuesByUuid(dset_uuid, [list(range(100))]*200)
+            props = db.getDatasetCreationProps(dset_uuid)
+            self.assertTrue(len(props['filters']) > 0)  # repetitive data compresses
+            self.assertEqual(props['filterGoal'], 'ratio')
+            hdf5_props = db.getHDF5DatasetCreationProperties(dset_uuid, 'H5T_INTEGER')
+            self.assertEqual([item['id'] for item in hdf5_props['filters']],
+                             [item['id'] for item in props['filters']])
+            self.assertEqual(db.getDatasetValuesByUuid(dset_uuid)[199][99], 99)
+            db.linkObject(root_uuid, dset_uuid, 'auto')
+            self.assertEqual(db.getUUIDByPath('/auto'), dset_uuid)
+
+            # linked before the first write, so the dataset can't be re-created
+            rsp = db.createDataset("H5T_STD_I32LE", (200, 100), creation_props={'filters': 'auto'})
+            linked_uuid = rsp['id']
+            db.linkObject(root_uuid, linked_uuid, 'linked')
+            db.setDatasetValuesByUuid(linked_uuid, [list(range(100))]*200)
+            self.assertEqual(db.getDatasetCreationProps(linked_uuid)['filters'], [])
+            self.assertEqual(db.getDatasetValuesByUuid(linked_uuid)[1][2], 2)
+
+            # every write method picks the filters
+            auto_props = {'filters': 'auto', 'filterGoal': 'ratio'}
+            rsp = db.createDataset("H5T_STD_I32LE", (200, 100), creation_props=auto_props)
+            db.setDatasetValuesBySelections(rsp['id'], [(slice(0, 200, 1), slice(0, 100, 1))],
+                                            [[list(range(100))]*200])
+            self.assertTrue(len(db.getDatasetCreationProps(rsp['id'])['filters']) > 0)
+            rsp = db.createDataset("H5T_STD_I32LE", (200, 100), creation_props=auto_props)
+            db.setDatasetValuesByPointSelection(rsp['id'], [0]*100, [[0, i] for i in range(100)])
+            self.assertTrue(db.getDatasetCreationProps(rsp['id'])['filters'] != 'auto')
+            rsp = db.createDataset("H5T_STD_I32LE", (0, 100), max_shape=(None, 100),
+                                   creation_props=auto_props)
+            db.appendDatasetValuesByUuid(rsp['id'], [list(range(100))]*200)
+            self.assertTrue(len(db.getDatasetCreationProps(rsp['id'])['filters']) > 0)
+            self.assertEqual(db.getDatasetValuesByUuid(rsp['id'])[199][99], 99)
+            rsp = db.createDataset("H5T_STD_I32LE", (200, 100), creation_props=auto_props)
+            chunks = db.getDatasetObjByUuid(rsp['id']).chunks
+            chunk = np.ones(chunks, dtype='<i4').tobytes()
+            db.setDatasetChunkByUuid(rsp['id'], (0, 0), chunk)
+            self.assertEqual(db.getDatasetCreationProps(rsp['id'])['filters'], [])  # stored as given
+            self.assertEqual(db.getDatasetValuesByUuid(rsp['id'])[0][0], 1)
+
+            try:
+                db.createDataset("H5T_STD_I32LE", (10,), creation_props={'filters': 'auto', 'filterGoal': 'fast'})
+                self.assertTrue(False)  # shouldn't get here
+            except IOError as e:
+                self.assertEqual(e.errno, errno.EINVAL)
+
+         with Hdf5db(filepath, app_logger=self.log) as db:
+            self.assertEqual(db.getUUIDByPath('/auto'), dset_uuid)
+            self.assertEqual(db.getDatasetValuesByUuid(dset_uuid)[0][50], 50)
+
+    def testCreateDatasetAccessHint(self):
+         filepath = getFile('empty.h5', 'createdatasetaccesshint.h5')
+         with Hdf5db(filepath, app_logger=self.log) as db:
+            creation_props = {'accessHint': 'column', 'chunkBytes': 4000}
+            rsp = db.createDataset("H5T_STD_I32LE", (10000, 100), creation_props=creation_props)
+            dset_uuid = rsp['id']
+            self.assertEqual(db.getDatasetObjByUuid(dset_uuid).chunks, (1000, 1))
+            props = db.getDatasetCreationProps(dset_uuid)
+            self.assertEqual(props['accessHint'], 'column')
+            self.assertEqual(props['layout'], {'class': 'H5D_CHUNKED', 'dims': [1000, 1]})
+            self.assertTrue('layout' not in creation_props)
+
+            rsp = db.createDataset("H5T_IEEE_F64LE", (0, 10), max_shape=(None, 10),
+                                   creation_props={'accessHint': 'append', 'chunkBytes': 8000})
+            self.assertEqual(db.getDatasetObjByUuid(rsp['id']).chunks, (100, 10))
+
+            rsp = db.createDataset("H5T_STD_U8LE", (1000, 1000), creation_props={'accessHint': 'tile'})
+            self.assertEqual(db.getDatasetObjByUuid(rsp['id']).chunks, (1000, 1000))
+            rsp = db.createDataset("H5T_STD_I32LE", (1000, 1000), creation_props={'accessHint': 'tile'})
+            self.assertEqual(db.getDatasetObjByUuid(rsp['id']).chunks, (512, 512))
+
+            # explicit chunk dims are used as given
+            creation_props = {'accessHint': 'row', 'layout': {'class': 'H5D_CHUNKED', 'dims': [10, 10]}}
+            rsp = db.createDataset("H5T_STD_I32LE", (100, 100), creation_props=creation_props)
+            self.assertEqual(db.getDatasetObjByUuid(rsp['id']).chunks, (10, 10))
+
+            try:
+                db.createDataset("H5T_STD_I32LE", (10,), creation_props={'accessHint': 'diagonal'})
+                self.assertTrue(False)  # shouldn't get here
+            except IOError as e:
+                self.assertEqual(e.errno, errno.EINVAL)
+
+    def testTimeStamps(self):
+         filepath = getFile('empty.h5', 'timestamps.h5')
+         # file with timestamps stored as {ctime}/{mtime} attributes
+         root_uuid = str(uuid.uuid1())
+         with h5py.File(filepath, 'r+') as f:
+            dbGrp = f.create_group("__db__")
+            dbGrp.attrs["rootUUID"] = root_uuid
+            for name in ("{groups}", "{datasets}", "{datatypes}", "{addr}"):
+                dbGrp.create_group(name)
+            dbGrp.create_group("{ctime}").attrs.create(root_uuid, 1000, dtype='int64')
+            dbGrp.create_group("{mtime}").attrs.create(root_uuid, 2000, dtype='int64')
+            dbGrp["{ctime}"].attrs.create(root_uuid + "_attr:[a1]", 1500, dtype='int64')
+
+         with Hdf5db(filepath, app_logger=self.log) as db:
+            self.assertEqual(db.getUUIDByPath('/'), root_uuid)
+            self.assertEqual(db.getCreateTime(root_uuid), 1000)
+            self.assertEqual(db.getModifiedTime(root_uuid), 2000)
+            self.assertEqual(db.getModifiedTime(root_uuid, objType="attribute", name="a1"), 1500)
+            self.assertEqual(db.getCreateTime("xyz", useRoot=False), None)
+            self.assertEqual(db.getCreateTime("xyz"), 1000)
+            for i in range(5000):  # more than one batch
+                db.setCreateTime(root_uuid, objType="link", name="l" + str(i), timestamp=3000 + i)
+            db.setModifiedTime(root_uuid, timestamp=9000)
+
+         with h5py.File(filepath, 'r') as f:
+            dbGrp = f["__db__"]
+            # old groups are kept for older versions
+            self.assertEqual(dbGrp["{ctime}"].attrs[root_uuid], 1000)
+            self.assertEqual(dbGrp["{mtime}"].attrs[root_uuid], 2000)
+            self.assertEqual(dbGrp["{timestamps}"].shape, (5002,))
+
+         with Hdf5db(filepath, app_logger=self.log) as db:
+            self.assertEqual(db.getUUIDByPath('/'), root_uuid)
+            self.assertEqual(db.getCreateTime(root_uuid), 1000)
+            self.assertEqual(db.getModifiedTime(root_uuid), 9000)
+            self.assertEqual(db.getCreateTime(root_uuid, objType="link", name="l4999"), 7999)
+            self.assertEqual(db.getModifiedTime(root_uuid, objType="link", name="l1"), 3001)
+
+    def testDeferredTimeStamps(self):
+         filepath = getFile('tall.h5', 'deferredtimestamps.h5')
+         with Hdf5db(filepath, app_logger=self.log, timestamp_max_age=None) as db:
+            d111Uuid = db.getUUIDByPath('/g1/g1.1/dset1.1.1')
+            db.flush()
+            nrows = db.dbGrp["{timestamps}"].shape[0]
+            for i in range(10):
+                db.setDatasetValuesByUuid(d111Uuid, [i]*10, (slice(i, i+1, 1), slice(0, 10, 1)))
+            db.setModifiedTime(d111Uuid, timestamp=12345)
+            # pending value is returned, but not written yet
+            self.assertEqual(db.getModifiedTime(d111Uuid), 12345)
+            self.assertTrue(12345 not in db.dbGrp["{timestamps}"]['mtime'])
+            db.flush()
+            mtimes = db.dbGrp["{timestamps}"]['mtime']
+            self.assertEqual(list(mtimes).count(12345), 1)  # updates coalesced
+            self.assertEqual(db.dbGrp["{timestamps}"].shape[0], nrows + 1)
+
+         with Hdf5db(filepath, app_logger=self.log, timestamp_max_age=0) as db:
+            d111Uuid = db.getUUIDByPath('/g1/g1.1/dset1.1.1')
+            self.assertEqual(db.getModifiedTime(d111Uuid), 12345)
+            db.setModifiedTime(d111Uuid, timestamp=23456)
+            self.assertTrue(23456 in db.dbGrp["{timestamps}"]['mtime'])
+
+         # idle changes are written by the next call to any method
+         with Hdf5db(filepath, app_logger=self.log, timestamp_max_age=0.01) as db:
+            d111Uuid = db.getUUIDByPath('/g1/g1.1/dset1.1.1')
+            db.setModifiedTime(d111Uuid, timestamp=34567)
+            self.assertTrue(34567 not in db.dbGrp["{timestamps}"]['mtime'])
+            time.sleep(0.05)
+            db.getUUIDByPath('/')
+            self.assertTrue(34567 in db.dbGrp["{timestamps}"]['mtime'])
+
+         # new files have the groups used by older versions, with the root timestamps
+         filepath = getFile('empty.h5', 'timestampgroups.h5')
+         with Hdf5db(filepath, app_logger=self.log) as db:
+            root_uuid = db.getUUIDByPath('/')
+            self.assertEqual(db.dbGrp["{ctime}"].attrs[root_uuid], db.getCreateTime(root_uuid))
+            self.assertEqual(db.dbGrp["{mtime}"].attrs[root_uuid], db.getModifiedTime(root_uuid))
+
+    def testStreamDatasetBytes(self):
+         filepath = getFile('tall.h5', 'streamdatasetbytes.h5')
+         with Hdf5db(filepath, app_logger=self.log) as db:
+            d111Uuid = db.getUUIDByPath('/g1/g1.1/dset1.1.1')
+            blocks = list(db.streamDatasetBytesByUuid(d111Uuid, block_bytes=80))
+            self.assertEqual(len(blocks), 5)
+            data = b''.join(blocks)
+            self.assertEqual(len(data), 400)
+            self.assertEqual(data[4*12:4*13], b'\x02\x00\x00\x00')  # little endian 1*2
+
+            slices = (slice(1, 10, 3), slice(2, 4, 1))
+            data = b''.join(db.streamDatasetBytesByUuid(d111Uuid, slices, block_bytes=8))
+            self.assertEqual(len(data), 24)
+            self.assertEqual(data[:4], b'\x02\x00\x00\x00')
+            self.assertEqual(data[-4:], b'\x15\x00\x00\x00')  # 7*3
+
+         filepath = getFile('dset_gzip.h5', 'streamdatasetbytesgzip.h5')
+         with Hdf5db(filepath, app_logger=self.log) as db:
+            dset_uuid = db.getUUIDByPath('/dset1')
+            slices = (slice(50, 450, 1), slice(0, 1000, 1))
+            binary = db.getDatasetValuesByUuid(dset_uuid, slices, format="binary")
+            blocks = list(db.streamDatasetBytesByUuid(dset_uuid, slices, block_bytes=100*8000))
+            self.assertEqual(len(blocks), 5)  # chunk aligned at 100, 200, 300, 400
+            self.assertEqual(b''.join(blocks), binary)
+
+            # block_bytes less than a row or a chunk is still a cap
+            blocks = list(db.streamDatasetBytesByUuid(dset_uuid, slices, block_bytes=300*8))
+            self.assertEqual(max(len(block) for block in blocks), 300*8)
+            self.assertEqual(len(blocks), 400*4)  # split at 300, 600, 900 in dim 1
+            self.assertEqual(b''.join(blocks), binary)
+            slices = (slice(50, 52, 1), slice(0, 10, 1))
+            blocks = list(db.streamDatasetBytesByUuid(dset_uuid, slices, block_bytes=4))
+            self.assertEqual(len(blocks), 20)  # single elements
+            self.assertEqual(b''.join(blocks), db.getDatasetValuesByUuid(dset_uuid, slices, format="binary"))
+
+         filepath = getFile('fixed_string_dset.h5', 'streamdatasetbytesstr.h5')
+         with Hdf5db(filepath, app_logger=self.log) as db:
+            dset_uuid = db.getUUIDByPath('/DS1')
+            if sys.version_info[0] > 2:
+                try:
+                    db.streamDatasetBytesByUuid(dset_uuid)
+                    self.assertTrue(False)  # expected exception
+                except IOError as e:
+                    self.assertEqual(e.errno, errno.EINVAL)
+
+    def testReadDatasetMemmap(self):
+         filepath = getFile('tall.h5', 'readdatasetmemmap.h5')
+         with Hdf5db(filepath, app_logger=self.log) as db:
+            d111Uuid = db.getUUIDByPath('/g1/g1.1/dset1.1.1')
+            mm = db.getDatasetMemmapByUuid(d111Uuid)
+            self.assertEqual(mm.shape, (10, 10))
+            self.assertFalse(mm.flags['WRITEABLE'])
+            for i in range(10):
+                for j in range(10):
+                    self.assertEqual(mm[i, j], i*j)
+            mm = db.getDatasetMemmapByUuid(d111Uuid, (slice(2, 4, 1), slice(0, 10, 2)))
+            self.assertEqual(mm.tolist(), [[0, 4, 8, 12, 16], [0, 6, 12, 18, 24]])
+            data = db.getDatasetValuesByUuid(d111Uuid, (slice(2, 4, 1), slice(0, 10, 1)), format="binary")
+            self.assertEqual(len(data), 80)
+            self.assertEqual(data[4:8], b'\x00\x00\x00\x02')  # big endian
+
+            # modified values are visible through the memmap
+            db.setDatasetValuesByUuid(d111Uuid, [42,], (slice(0, 1, 1), slice(0, 1, 1)))
+            mm = db.getDatasetMemmapByUuid(d111Uuid)
+            self.assertEqual(mm[0, 0], 42)
+
+            # small reads bypass the memory map, explicit maps do not
+            dset = db.getDatasetObjByUuid(d111Uuid)
+            self.assertTrue(db._getDatasetMemmap(dset, Ellipsis, 1024) is None)
+            self.assertTrue(db._getDatasetMemmap(dset, Ellipsis) is not None)
+            self.assertFalse(db._memmap_flush)
+            db.setDatasetValuesByUuid(d111Uuid, [7,], (slice(0, 1, 1), slice(0, 1, 1)))
+            self.assertTrue(db._memmap_flush)
+            self.assertEqual(db.getDatasetMemmapByUuid(d111Uuid)[0, 0], 7)
+            self.assertFalse(db._memmap_flush)
+
+            # value reads go through HDF5 unless memmap_reads is set, so
+            # writes through the h5py object are seen
+            rsp = db.createDataset("H5T_IEEE_F64LE", (512, 256))
+            big_uuid = rsp['id']
+            db.setDatasetValuesByUuid(big_uuid, [[1.0]*256]*512)
+            big_dset = db.getDatasetObjByUuid(big_uuid)
+            big_dset[0, 0] = 2.0
+            data = db.getDatasetValuesByUuid(big_uuid, format="binary")
+            self.assertEqual(np.frombuffer(data, dtype='<f8')[0], 2.0)
+            db.memmap_reads = True
+            self.assertTrue(db._getMemmapRead(big_dset, Ellipsis) is not None)
+            self.assertTrue(db._getMemmapRead(big_dset, (slice(0, 1, 1), slice(0, 1, 1))) is None)
+            data = db.getDatasetValuesByUuid(big_uuid, format="binary")
+            self.assertEqual(np.frombuffer(data, dtype='<f8')[:2].tolist(), [2.0, 1.0])
+
+         filepath = getFile('dset_gzip.h5', 'readdatasetmemmapgzip.h5')
+         with Hdf5db(filepath, app_logger=self.log) as db:
+            dset_uuid = db.getUUIDByPath('/dset1')
+            self.assertTrue(db.getDatasetMemmapByUuid(dset_uuid) is None)
+
     def testReadCompoundDataset(self):
          filepath = getFile('compound.h5', 'readcompound.h5')
          with Hdf5db(filepath, app_logger=self.log) as db:
@@ -1177,6 +1957,73 @@ class Hdf5dbTest(unittest.TestCase):
             self.assertEqual(acl['readACL'], 0)
             self.assertEqual(acl['updateACL'], 0)
             
+    def testAclCache(self):
+        filepath = getFile('tall.h5', 'aclcache.h5')
+        user1 = 123
+        user2 = 456
+        with Hdf5db(filepath, app_logger=self.log) as db:
+            root_uuid = db.getUUIDByPath('/')
+            d111_uuid = db.getUUIDByPath('/g1/g1.1/dset1.1.1')
+            self.assertEqual(db.getAcl(d111_uuid, user1)['update'], 1)  # default acl
+
+            acl_root = db.getDefaultAcl()
+            acl_root['update'] = 0
+            db.setAcl(root_uuid, acl_root)  # default user at root
+            acl_user1 = db.getDefaultAcl()
+            acl_user1['userid'] = user1
+            acl_user1['delete'] = 0
+            db.setAcl(d111_uuid, acl_user1)
+
+            acl = db.getAcl(d111_uuid, user1)
+            self.assertEqual((acl['userid'], acl['update'], acl['delete']), (user1, 1, 0))
+            acl['delete'] = 1  # returned acl is a copy
+            self.assertEqual(db.getAcl(d111_uuid, user1)['delete'], 0)
+            acl = db.getAcl(d111_uuid, user2)  # falls back to root default user
+            self.assertEqual((acl['userid'], acl['update']), (0, 0))
+
+            # changes are seen after setAcl
+            acl_user1['delete'] = 1
+            db.setAcl(d111_uuid, acl_user1)
+            self.assertEqual(db.getAcl(d111_uuid, user1)['delete'], 1)
+            acl_root['update'] = 1
+            db.setAcl(root_uuid, acl_root)
+            self.assertEqual(db.getAcl(d111_uuid, user2)['update'], 1)
+
+    def testBulkAcls(self):
+        filepath = getFile('tall.h5', 'bulkacls.h5')
+        with Hdf5db(filepath, app_logger=self.log) as db:
+            root_uuid = db.getUUIDByPath('/')
+            g1_uuid = db.getUUIDByPath('/g1')
+            d111_uuid = db.getUUIDByPath('/g1/g1.1/dset1.1.1')
+            db.setAcl(d111_uuid, {'userid': 1, 'read': 1})
+            acls = []
+            for userid in range(1, 1001):
+                acls.append({'userid': userid, 'read': 1, 'update': userid % 2})
+            acls.append({'userid': 2, 'delete': 1})  # later acl for a user is merged in
+            db.setAcls(d111_uuid, acls)
+            self.assertEqual(db.getNumAcls(d111_uuid), 1000)
+            acl = db.getAcl(d111_uuid, 2)
+            self.assertEqual((acl['read'], acl['update'], acl['delete'], acl['create']), (1, 0, 1, 0))
+            self.assertEqual(db.getAcl(d111_uuid, 999)['update'], 1)
+            self.assertEqual(db.getAcls(d111_uuid)[-1]['userid'], 1000)
+
+            db.setAcls(root_uuid, [db.getDefaultAcl()])
+            acls = db.getAclsForUser(3, [d111_uuid, g1_uuid])
+            self.assertEqual(acls[d111_uuid]['userid'], 3)
+            self.assertEqual(acls[d111_uuid]['update'], 1)
+            self.assertEqual(acls[g1_uuid]['userid'], 0)  # root acl for default user
+
+            try:
+                db.setAcls(d111_uuid, [{'read': 1}])
+                self.assertTrue(False)  # shouldn't get here
+            except IOError as e:
+                self.assertEqual(e.errno, errno.EINVAL)
+            try:
+                db.setAcls(d111_uuid, [{'userid': 5, 'execute': 1}])
+                self.assertTrue(False)  # shouldn't get here
+            except IOError as e:
+                self.assertEqual(e.errno, errno.EINVAL)
+
     def testGetEvalStr(self):
         queries = { "date == 23": "rows['date'] == 23",
                     "wind == b'W 5'": "rows['wind'] == b'W 5'",
@@ -1226,8 +2073,183 @@ class Hdf5dbTest(unittest.TestCase):
                     self.assertTrue(False)  # shouldn't get here
                 except IOError as e:
                     pass  # ok
-             
- 
+
+    def testReadPointSelection(self):
+        filepath = getFile('tall.h5', 'readpointselection.h5')
+        with Hdf5db(filepath, app_logger=self.log) as db:
+            d111_uuid = db.getUUIDByPath('/g1/g1.1/dset1.1.1')
+            values = db.getDatasetPointSelectionByUuid(d111_uuid, [[1, 2], [9, 9], [3, 3], [1, 2]])
+            self.assertEqual(values, [2, 81, 9, 2])
+            d112_uuid = db.getUUIDByPath('/g1/g1.1/dset1.1.2')
+            values = db.getDatasetPointSelectionByUuid(d112_uuid, [19, 0, 5])
+            self.assertEqual(values, [19, 0, 5])
+            self.assertEqual(db.getDatasetPointSelectionByUuid(d112_uuid, []), [])
+            for points in ([20,], [-1,], [[1, 2, 3],]):
+                try:
+                    db.getDatasetPointSelectionByUuid(d112_uuid, points)
+                    self.assertTrue(False)  # shouldn't get here
+                except IOError as e:
+                    self.assertEqual(e.errno, errno.EINVAL)
+
+        filepath = getFile('compound.h5', 'readpointselectioncompound.h5')
+        with Hdf5db(filepath, app_logger=self.log) as db:
+            dset_uuid = db.getUUIDByPath('/dset')
+            values = db.getDatasetPointSelectionByUuid(dset_uuid, [0, 3])
+            self.assertEqual(len(values), 2)
+            self.assertEqual(values[0][2], 63)
+            self.assertEqual(values[1][2], 58)
+
+        filepath = getFile('array_dset.h5', 'readpointselectionarray.h5')
+        with Hdf5db(filepath, app_logger=self.log) as db:
+            dset_uuid = db.getUUIDByPath('/DS1')
+            values = db.getDatasetPointSelectionByUuid(dset_uuid, [1, 0])
+            self.assertEqual(len(values), 2)
+            self.assertEqual(values[0][1], [1, 1, 1, 1, 1])
+            self.assertEqual(values[1][2], [0, -2, -4, -6, -8])
+
+    def testWritePointSelection(self):
+        filepath = getFile('tall.h5', 'writepointselection.h5')
+        with Hdf5db(filepath, app_logger=self.log) as db:
+            d111_uuid = db.getUUIDByPath('/g1/g1.1/dset1.1.1')
+            points = [[1, 2], [9, 9], [3, 3]]
+            db.setDatasetValuesByPointSelection(d111_uuid, [-1, -2, -3], points)
+            values = db.getDatasetPointSelectionByUuid(d111_uuid, points)
+            self.assertEqual(values, [-1, -2, -3])
+            values = db.getDatasetValuesByUuid(d111_uuid)
+            self.assertEqual(values[1][1], 1)  # not modified
+
+            d112_uuid = db.getUUIDByPath('/g1/g1.1/dset1.1.2')
+            data = b'\x00\x00\x00\x2a\x00\x00\x00\x2b'  # big endian 42, 43
+            db.setDatasetValuesByPointSelection(d112_uuid, data, [4, 7], format="binary")
+            values = db.getDatasetPointSelectionByUuid(d112_uuid, [4, 7])
+            self.assertEqual(values, [42, 43])
+
+            try:
+                db.setDatasetValuesByPointSelection(d112_uuid, [1, 2, 3], [4, 7])
+                self.assertTrue(False)  # shouldn't get here
+            except IOError as e:
+                self.assertEqual(e.errno, errno.EINVAL)
+
+            # large point selection on a chunked dataset
+            layout = {"class": "H5D_CHUNKED", "dims": [100, 100]}
+            rsp = db.createDataset("H5T_STD_I32LE", (1000, 1000), creation_props={"layout": layout})
+            dset_uuid = rsp['id']
+            points = [[i % 1000, (i * 7) % 1000] for i in range(300000)]
+            data = [i % 1000 for i in range(300000)]
+            db.setDatasetValuesByPointSelection(dset_uuid, data, points)
+            values = db.getDatasetPointSelectionByUuid(dset_uuid, points[-10:])
+            self.assertEqual(values, data[-10:])
+
+        filepath = getFile('compound.h5', 'writepointselectioncompound.h5')
+        with Hdf5db(filepath, app_logger=self.log) as db:
+            dset_uuid = db.getUUIDByPath('/dset')
+            data = [[25, "00:00", 99, 30.0, "N 1"], [25, "01:00", 98, 30.1, "N 2"]]
+            db.setDatasetValuesByPointSelection(dset_uuid, data, [5, 10])
+            values = db.getDatasetPointSelectionByUuid(dset_uuid, [5, 10])
+            self.assertEqual(values[0][2], 99)
+            self.assertEqual(values[1][2], 98)
+
+        filepath = getFile('array_dset.h5', 'writepointselectionarray.h5')
+        with Hdf5db(filepath, app_logger=self.log) as db:
+            dset_uuid = db.getUUIDByPath('/DS1')
+            data = [[[i * 10 + j] * 5 for j in range(3)] for i in range(2)]
+            db.setDatasetValuesByPointSelection(dset_uuid, data, [3, 1])
+            values = db.getDatasetPointSelectionByUuid(dset_uuid, [1, 3, 0])
+            self.assertEqual(values[0], data[1])
+            self.assertEqual(values[1], data[0])
+            self.assertEqual(values[2][1], [0, -1, -2, -3, -4])  # not modified
+
+    def testDatasetQuery(self):
+        filepath = getFile('compound.h5', 'datasetquery.h5')
+        with Hdf5db(filepath, app_logger=self.log) as db:
+            dset_uuid = db.getUUIDByPath('/dset')
+            (indexes, values) = db.doDatasetQueryByUuid(dset_uuid, "temp > 75")
+            self.assertEqual(len(indexes), len(values))
+            self.assertTrue(len(indexes) > 0)
+            for i in range(len(indexes)):
+                self.assertTrue(values[i][2] > 75)
+            (indexes, values) = db.doDatasetQueryByUuid(dset_uuid, "temp > 61", limit=5)
+            self.assertEqual(len(indexes), 5)
+
+    def testDatasetQueryMultiDim(self):
+        filepath = getFile('tall.h5', 'datasetquerymultidim.h5')
+        with Hdf5db(filepath, app_logger=self.log) as db:
+            # values are i*j for a 10x10 dataset
+            d111_uuid = db.getUUIDByPath('/g1/g1.1/dset1.1.1')
+            (indexes, values) = db.doDatasetQueryByUuid(d111_uuid, "value > 50")
+            expected = [[i, j] for i in range(10) for j in range(10) if i*j > 50]
+            self.assertEqual(indexes, expected)
+            self.assertEqual(values, [i*j for (i, j) in expected])
+
+            (indexes, values) = db.doDatasetQueryByUuid(d111_uuid, "value > 50", start=8, limit=3)
+            self.assertEqual(indexes, [[8, 7], [8, 8], [8, 9]])
+
+            item = db.doDatasetAggregateByUuid(d111_uuid, ["count", "max(value)"], query="value > 50")
+            self.assertEqual(item["count"], len(expected))
+            self.assertEqual(item["max(value)"], 81)
+
+            # one-dimensional dataset
+            d112_uuid = db.getUUIDByPath('/g1/g1.1/dset1.1.2')
+            (indexes, values) = db.doDatasetQueryByUuid(d112_uuid, "(value >= 3) & (value < 6)")
+            self.assertEqual(indexes, [3, 4, 5])
+
+        filepath = getFile('dset_gzip.h5', 'datasetquerychunked.h5')
+        with Hdf5db(filepath, app_logger=self.log) as db:
+            dset_uuid = db.getUUIDByPath('/dset1')
+            item = db.doDatasetAggregateByUuid(dset_uuid, ["count", "sum(value)"])
+            self.assertEqual(item["count"], 1000*1000)
+            (indexes, values) = db.doDatasetQueryByUuid(dset_uuid, "value >= 0", limit=10)
+            self.assertEqual(len(indexes), 10)
+            self.assertEqual(len(indexes[0]), 2)
+
+        filepath = getFile('empty.h5', 'datasetquerylargerows.h5')
+        with Hdf5db(filepath, app_logger=self.log) as db:
+            # rows larger than a block are read in pieces along the last dim
+            rsp = db.createDataset("H5T_IEEE_F64LE", (3, 2, 1024*1024))
+            dset_uuid = rsp['id']
+            dset = db.getDatasetObjByUuid(dset_uuid)
+            self.assertEqual(db._getBlockShape(dset), (1, 1, 512*1024))
+            db.setDatasetValuesByUuid(dset_uuid, [7.0, 8.0], (slice(1, 2, 1), slice(1, 2, 1), slice(524287, 524289, 1)))
+            db.setDatasetValuesByUuid(dset_uuid, [9.0], (slice(2, 3, 1), slice(0, 1, 1), slice(5, 6, 1)))
+            (indexes, values) = db.doDatasetQueryByUuid(dset_uuid, "value > 0")
+            self.assertEqual(indexes, [[1, 1, 524287], [1, 1, 524288], [2, 0, 5]])
+            self.assertEqual(values, [7.0, 8.0, 9.0])
+            item = db.doDatasetAggregateByUuid(dset_uuid, ["count", "sum(value)"], start=1)
+            self.assertEqual(item["count"], 2*2*1024*1024)
+            self.assertEqual(item["sum(value)"], 24.0)
+
+    def testDatasetAggregate(self):
+        filepath = getFile('compound.h5', 'datasetaggregate.h5')
+        with Hdf5db(filepath, app_logger=self.log) as db:
+            dset_uuid = db.getUUIDByPath('/dset')
+            aggregates = ("count", "sum(temp)", "min(temp)", "max(temp)", "mean(pressure)")
+            item = db.doDatasetAggregateByUuid(dset_uuid, aggregates)
+            self.assertEqual(item["count"], 72)
+            self.assertEqual(item["sum(temp)"], 4596)
+            self.assertEqual(item["min(temp)"], 58)
+            self.assertEqual(item["max(temp)"], 79)
+            self.assertTrue(29.0 < item["mean(pressure)"] < 31.0)
+
+            item = db.doDatasetAggregateByUuid(dset_uuid, ["count"], query="temp > 61")
+            self.assertEqual(item["count"], 53)
+
+            items = db.doDatasetAggregateByUuid(dset_uuid, ["count", "max(temp)"], group_by="date")
+            self.assertEqual(len(items), 4)
+            self.assertEqual(sum(item["count"] for item in items), 72)
+            for item in items:
+                self.assertTrue(item["date"] in (21, 22, 23, 24))
+
+            items = db.doDatasetAggregateByUuid(dset_uuid, "count", group_by="wind")
+            self.assertTrue(type(items[0]["wind"]) is str)
+
+            for aggregates in ("median(temp)", "sum(wind)", "sum(foobar)", "sum(temp"):
+                try:
+                    db.doDatasetAggregateByUuid(dset_uuid, aggregates)
+                    self.assertTrue(False)  # shouldn't get here
+                except IOError as e:
+                    self.assertEqual(e.errno, errno.EINVAL)
+
+
 
 
 if __name__ == '__main__':